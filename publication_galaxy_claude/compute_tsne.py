@@ -107,7 +107,8 @@ tsne_results = compute_tsne_from_embeddings(
     perplexity=40,
     n_iter=1000,
     use_pca=True,
-    pca_components=50
+    pca_components=50,
+    pca_cache_dir=DEFAULT_OUTPUT_DIR
 )
 
 # %% [GENERATION-3D] Save results
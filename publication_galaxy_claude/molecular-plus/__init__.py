@@ -26,27 +26,33 @@ def mol_restore_on_load(dummy):
     Auto-restore particle sizes and field colors from CSV when file loads.
     Runs ONCE on file load - enables command line renders to work correctly.
     """
-    # Delay execution slightly to ensure all data is loaded
-    # Use a timer to run after Blender finishes loading
-    def _do_restore():
+    # Defer until the first depsgraph update, when scene data is ready
+    # One-shot handler: removes itself before doing any work
+    def _do_restore(scene, depsgraph):
+        if _do_restore in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(_do_restore)
+
         try:
-            # Only restore if there are particle systems with mol_active and CSV set
-            for obj in bpy.data.objects:
-                for psys in obj.particle_systems:
-                    if psys.settings.mol_active and psys.settings.mol_initial_csv:
-                        print("Molecular+: Auto-restoring sizes and colors from CSV...")
-                        bpy.ops.object.mol_restore_sizes()
-                        bpy.ops.object.mol_restore_fields()
-                        print("Molecular+: Restore complete.")
-                        return None  # Done, don't repeat
-            # No molecular particle systems with CSV found
-            return None
+            # Only restore if some particle settings have mol_active and a CSV.
+            # Scanning the settings datablocks directly is cheap (no walk over
+            # every object and particle system) and works for any saved file
+            if not any(settings.mol_active and settings.mol_initial_csv
+                       for settings in bpy.data.particles):
+                # No molecular particle systems with CSV found
+                return
+
+            # Call the restore implementations directly rather than through
+            # bpy.ops, avoiding operator context/undo overhead inside the handler
+            from .operators import _restore_sizes_impl, _restore_fields_impl
+
+            print("Molecular+: Auto-restoring sizes and colors from CSV...")
+            _restore_sizes_impl(bpy.context)
+            _restore_fields_impl(bpy.context)
+            print("Molecular+: Restore complete.")
         except Exception as e:
             print(f"Molecular+: Auto-restore skipped ({e})")
-            return None
 
-    # Run after 0.1 seconds to let Blender finish loading
-    bpy.app.timers.register(_do_restore, first_interval=0.1)
+    bpy.app.handlers.depsgraph_update_post.append(_do_restore)
 
 
 bl_info = {
@@ -41,6 +41,14 @@ cpdef init(importdata):
     parlist = <Particle *>malloc(parnum * cython.sizeof(Particle))
     parlistcopy = <SParticle *>malloc(parnum * cython.sizeof(SParticle))
     cdef int jj = 0
+    # Typed views of each system's exported NumPy buffers: element reads
+    # compile to plain C indexing instead of creating a Python scalar each
+    cdef const float[::1] par_loc
+    cdef const float[::1] par_vel
+    cdef const float[::1] par_size
+    cdef const float[::1] par_mass
+    cdef const short[::1] par_alive
+    cdef const float[::1] par_weak
 
     for i in range(psysnum):
         psys[i].id = i
@@ -105,18 +113,24 @@ cpdef init(importdata):
         psys[i].gravity_initial_rotation = importdata[i + 1][6][54]
         psys[i].gravity_rotation_falloff = importdata[i + 1][6][55]
 
+        par_loc = importdata[i + 1][1]
+        par_vel = importdata[i + 1][2]
+        par_size = importdata[i + 1][3]
+        par_mass = importdata[i + 1][4]
+        par_alive = importdata[i + 1][5]
+        par_weak = importdata[i + 1][7]
         for ii in range(psys[i].parnum):
             parlist[jj].id = jj
-            parlist[jj].loc[0] = importdata[i + 1][1][(ii * 3)]
-            parlist[jj].loc[1] = importdata[i + 1][1][(ii * 3) + 1]
-            parlist[jj].loc[2] = importdata[i + 1][1][(ii * 3) + 2]
-            parlist[jj].vel[0] = importdata[i + 1][2][(ii * 3)]
-            parlist[jj].vel[1] = importdata[i + 1][2][(ii * 3) + 1]
-            parlist[jj].vel[2] = importdata[i + 1][2][(ii * 3) + 2]
-            parlist[jj].size = importdata[i + 1][3][ii]
-            parlist[jj].mass = importdata[i + 1][4][ii]
-            parlist[jj].state = importdata[i + 1][5][ii]
-            parlist[jj].weak = importdata[i + 1][7][ii]
+            parlist[jj].loc[0] = par_loc[(ii * 3)]
+            parlist[jj].loc[1] = par_loc[(ii * 3) + 1]
+            parlist[jj].loc[2] = par_loc[(ii * 3) + 2]
+            parlist[jj].vel[0] = par_vel[(ii * 3)]
+            parlist[jj].vel[1] = par_vel[(ii * 3) + 1]
+            parlist[jj].vel[2] = par_vel[(ii * 3) + 2]
+            parlist[jj].size = par_size[ii]
+            parlist[jj].mass = par_mass[ii]
+            parlist[jj].state = par_alive[ii]
+            parlist[jj].weak = par_weak[ii]
             parlist[jj].sys = &psys[i]
             parlist[jj].collided_with = <int *>malloc(1 * cython.sizeof(int))
             parlist[jj].collided_num = 0
@@ -2,15 +2,49 @@
 # Pushes overlapping particles apart before simulation starts
 # NOTE: This file is concatenated after simulate.pyx, so imports are inherited
 
-
-cpdef relax_overlaps(float[:] par_loc, float[:] par_size, int max_iterations, float min_separation, float strength, int num_threads):
+# Below this many particles the grid costs more than it saves: put everything in
+# a single cell, which degenerates to a plain pairwise scan over the same code path
+cdef enum:
+    RELAX_GRID_MIN_PARTICLES = 32
+    # Cell coordinates are clamped to +-this before the int cast, which would
+    # otherwise overflow (undefined behaviour) for extreme extents or tiny cells.
+    # Clamped particles share edge cells: more pair tests, never a missed overlap.
+    RELAX_CELL_LIMIT = 1 << 30
+
+
+cdef inline int relax_cell_coord(float offset, float inv_cell_size) noexcept nogil:
+    """Integer cell coordinate of an offset from the grid origin, clamped to RELAX_CELL_LIMIT."""
+    cdef float c = floor(offset * inv_cell_size)
+    if not (c > -RELAX_CELL_LIMIT):  # Also catches NaN
+        return -RELAX_CELL_LIMIT
+    if c > RELAX_CELL_LIMIT:
+        return RELAX_CELL_LIMIT
+    return <int>c
+
+
+cdef inline unsigned int relax_cell_hash(int cx, int cy, int cz, unsigned int mask) noexcept nogil:
+    """Prime-XOR hash of integer cell coordinates into a power-of-two table."""
+    return ((<unsigned int>cx * 73856093u) ^ (<unsigned int>cy * 19349663u) ^ (<unsigned int>cz * 83492791u)) & mask
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef relax_overlaps(float[::1] par_loc, float[::1] par_size, int max_iterations, float min_separation, float strength, int num_threads):
     """
     Push overlapping particles apart until no overlaps remain.
     Uses spatial hash for O(n) neighbor lookups instead of O(n²).
 
+    Cells are hashed into a table of ~2n buckets, so memory and per-pass cost
+    stay O(n) however far apart outliers are; bucket collisions are filtered
+    by comparing each candidate's integer cell coordinates.
+
+    Cells are swept in 27 colour classes ((x, y, z) mod 3). Cells of one
+    class are at least 3 apart, so their 3x3x3 neighbourhoods never share a
+    particle and each class runs in parallel with in-place (Gauss-Seidel) pushes.
+
     Args:
-        par_loc: array of [x,y,z,x,y,z,...] particle positions (modified in place)
-        par_size: array of particle radii
+        par_loc: C-contiguous float32 [x,y,z,x,y,z,...] particle positions (modified in place)
+        par_size: C-contiguous float32 particle radii
         max_iterations: maximum relaxation passes
         min_separation: target separation as multiple of sum of radii (1.001 = tiny gap)
         strength: how much to push apart per iteration (0.5=gentle, 1.0=full, 0.8=recommended)
@@ -36,197 +70,184 @@ cpdef relax_overlaps(float[:] par_loc, float[:] par_size, int max_iterations, fl
 
     # Cell size = 2 * max_size * min_separation (ensures we catch all potential overlaps)
     cdef float cell_size = max_size * 2.0 * min_separation * 1.1
-
-    # Find bounds
-    cdef float min_x = par_loc[0], max_x = par_loc[0]
-    cdef float min_y = par_loc[1], max_y = par_loc[1]
-    cdef float min_z = par_loc[2], max_z = par_loc[2]
-
+    if cell_size <= 0.0:
+        return (0, 0, 0)  # Zero radii or separation: nothing can overlap
+    cdef float inv_cell_size = 1.0 / cell_size
+    if n < RELAX_GRID_MIN_PARTICLES:
+        inv_cell_size = 0.0  # every particle lands in cell (0, 0, 0)
+
+    # Origin only keeps coordinates small; the hash handles any extent
+    cdef float min_x = par_loc[0], min_y = par_loc[1], min_z = par_loc[2]
     for i in range(n):
         if par_loc[i*3] < min_x: min_x = par_loc[i*3]
-        if par_loc[i*3] > max_x: max_x = par_loc[i*3]
         if par_loc[i*3+1] < min_y: min_y = par_loc[i*3+1]
-        if par_loc[i*3+1] > max_y: max_y = par_loc[i*3+1]
         if par_loc[i*3+2] < min_z: min_z = par_loc[i*3+2]
-        if par_loc[i*3+2] > max_z: max_z = par_loc[i*3+2]
-
-    # Add padding
-    min_x -= cell_size
-    min_y -= cell_size
-    min_z -= cell_size
-    max_x += cell_size
-    max_y += cell_size
-    max_z += cell_size
-
-    # Grid dimensions - cap at 10M cells to avoid memory issues
-    cdef int MAX_CELLS = 10000000
-    cdef int grid_x = <int>((max_x - min_x) / cell_size) + 1
-    cdef int grid_y = <int>((max_y - min_y) / cell_size) + 1
-    cdef int grid_z = <int>((max_z - min_z) / cell_size) + 1
-
-    # If grid too large, increase cell size
-    cdef long total_cells_long = <long>grid_x * <long>grid_y * <long>grid_z
-    while total_cells_long > MAX_CELLS and cell_size < 1000.0:
-        cell_size *= 2.0
-        grid_x = <int>((max_x - min_x) / cell_size) + 1
-        grid_y = <int>((max_y - min_y) / cell_size) + 1
-        grid_z = <int>((max_z - min_z) / cell_size) + 1
-        total_cells_long = <long>grid_x * <long>grid_y * <long>grid_z
-
-    cdef int total_cells = <int>total_cells_long
-
-    # Allocate cell arrays (using malloc, then zero manually)
-    cdef int *cell_counts = <int *>malloc(total_cells * sizeof(int))
-    cdef int *cell_starts = <int *>malloc(total_cells * sizeof(int))
-    cdef int *particle_cells = <int *>malloc(n * sizeof(int))
+
+    # Power-of-two bucket table, at least 2n entries
+    cdef int table_size = 1
+    while table_size < 2 * n:
+        table_size *= 2
+    cdef unsigned int mask = <unsigned int>(table_size - 1)
+
+    # Allocate once, reused by every pass
+    cdef int *bucket_counts = <int *>malloc(table_size * sizeof(int))
+    cdef int *bucket_starts = <int *>malloc(table_size * sizeof(int))
+    cdef int *particle_buckets = <int *>malloc(n * sizeof(int))
+    cdef int *particle_cell = <int *>malloc(n * 3 * sizeof(int))
+    cdef int *particle_color = <int *>malloc(n * sizeof(int))
     cdef int *sorted_indices = <int *>malloc(n * sizeof(int))
 
-    if cell_counts == NULL or cell_starts == NULL or particle_cells == NULL or sorted_indices == NULL:
-        if cell_counts != NULL: free(cell_counts)
-        if cell_starts != NULL: free(cell_starts)
-        if particle_cells != NULL: free(particle_cells)
+    if bucket_counts == NULL or bucket_starts == NULL or particle_buckets == NULL or particle_cell == NULL or particle_color == NULL or sorted_indices == NULL:
+        if bucket_counts != NULL: free(bucket_counts)
+        if bucket_starts != NULL: free(bucket_starts)
+        if particle_buckets != NULL: free(particle_buckets)
+        if particle_cell != NULL: free(particle_cell)
+        if particle_color != NULL: free(particle_color)
         if sorted_indices != NULL: free(sorted_indices)
         return (0, 0, -1)  # Error
 
-    # Zero cell_counts
-    for i in range(total_cells):
-        cell_counts[i] = 0
-
-    cdef int cell_x, cell_y, cell_z, cell_idx
+    cdef int bucket
     cdef float xi, yi, zi, xj, yj, zj, ri, rj
     cdef float dx, dy, dz, dist_sq, dist, min_dist, overlap
     cdef float inv_dist, nx, ny, nz
     cdef int start_idx, end_idx, neighbor_idx
-    cdef int cx, cy, cz, ncx, ncy, ncz, neighbor_cell
-
-    for iteration in range(max_iterations):
-        overlaps_this_pass = 0
-
-        # Reset cell counts
-        for i in range(total_cells):
-            cell_counts[i] = 0
-
-        # Count particles per cell
-        for i in range(n):
-            cell_x = <int>((par_loc[i*3] - min_x) / cell_size)
-            cell_y = <int>((par_loc[i*3+1] - min_y) / cell_size)
-            cell_z = <int>((par_loc[i*3+2] - min_z) / cell_size)
-            if cell_x < 0: cell_x = 0
-            if cell_x >= grid_x: cell_x = grid_x - 1
-            if cell_y < 0: cell_y = 0
-            if cell_y >= grid_y: cell_y = grid_y - 1
-            if cell_z < 0: cell_z = 0
-            if cell_z >= grid_z: cell_z = grid_z - 1
-            cell_idx = cell_x + cell_y * grid_x + cell_z * grid_x * grid_y
-            particle_cells[i] = cell_idx
-            cell_counts[cell_idx] += 1
-
-        # Calculate cell starts (prefix sum)
-        cell_starts[0] = 0
-        for i in range(1, total_cells):
-            cell_starts[i] = cell_starts[i-1] + cell_counts[i-1]
-
-        # Reset counts for placement
-        for i in range(total_cells):
-            cell_counts[i] = 0
-
-        # Place particles into sorted array
-        for i in range(n):
-            cell_idx = particle_cells[i]
-            sorted_indices[cell_starts[cell_idx] + cell_counts[cell_idx]] = i
-            cell_counts[cell_idx] += 1
-
-        # Check each particle against neighbors in adjacent cells
-        for i in range(n):
-            xi = par_loc[i*3]
-            yi = par_loc[i*3+1]
-            zi = par_loc[i*3+2]
-            ri = par_size[i]
-
-            cx = <int>((xi - min_x) / cell_size)
-            cy = <int>((yi - min_y) / cell_size)
-            cz = <int>((zi - min_z) / cell_size)
-
-            # Check 3x3x3 neighborhood
-            for ncx in range(cx - 1, cx + 2):
-                if ncx < 0 or ncx >= grid_x:
-                    continue
-                for ncy in range(cy - 1, cy + 2):
-                    if ncy < 0 or ncy >= grid_y:
-                        continue
-                    for ncz in range(cz - 1, cz + 2):
-                        if ncz < 0 or ncz >= grid_z:
+    cdef int cx, cy, cz, ncx, ncy, ncz, neighbor_bucket
+    cdef int color, p
+
+    # The whole kernel runs without the GIL, so relaxations of independent
+    # particle systems can run concurrently from Python threads
+    cdef int iterations_used = max_iterations
+    with nogil:
+        for iteration in range(max_iterations):
+            overlaps_this_pass = 0
+
+            # Reset bucket counts
+            for i in range(table_size):
+                bucket_counts[i] = 0
+
+            # Bin particles: integer cell, colour class and bucket
+            for i in range(n):
+                cx = relax_cell_coord(par_loc[i*3] - min_x, inv_cell_size)
+                cy = relax_cell_coord(par_loc[i*3+1] - min_y, inv_cell_size)
+                cz = relax_cell_coord(par_loc[i*3+2] - min_z, inv_cell_size)
+                particle_cell[i*3] = cx
+                particle_cell[i*3+1] = cy
+                particle_cell[i*3+2] = cz
+                particle_color[i] = (cx % 3 + 3) % 3 + 3 * ((cy % 3 + 3) % 3) + 9 * ((cz % 3 + 3) % 3)
+                bucket = <int>relax_cell_hash(cx, cy, cz, mask)
+                particle_buckets[i] = bucket
+                bucket_counts[bucket] += 1
+
+            # Calculate bucket starts (prefix sum)
+            bucket_starts[0] = 0
+            for i in range(1, table_size):
+                bucket_starts[i] = bucket_starts[i-1] + bucket_counts[i-1]
+
+            # Reset counts for placement
+            for i in range(table_size):
+                bucket_counts[i] = 0
+
+            # Place particles into sorted array
+            for i in range(n):
+                bucket = particle_buckets[i]
+                sorted_indices[bucket_starts[bucket] + bucket_counts[bucket]] = i
+                bucket_counts[bucket] += 1
+
+            # Check each particle against neighbors in adjacent cells, one colour
+            # class at a time. A cell always maps to one bucket, so one thread owns it.
+            for color in range(27):
+                for bucket in prange(table_size, schedule='dynamic', chunksize=256, num_threads=num_threads):
+                    for p in range(bucket_starts[bucket], bucket_starts[bucket] + bucket_counts[bucket]):
+                        i = sorted_indices[p]
+                        if particle_color[i] != color:
                             continue
 
-                        neighbor_cell = ncx + ncy * grid_x + ncz * grid_x * grid_y
-                        start_idx = cell_starts[neighbor_cell]
-                        end_idx = start_idx + cell_counts[neighbor_cell]
-
-                        for neighbor_idx in range(start_idx, end_idx):
-                            j = sorted_indices[neighbor_idx]
-
-                            # Only process each pair once (j > i)
-                            if j <= i:
-                                continue
-
-                            xj = par_loc[j*3]
-                            yj = par_loc[j*3+1]
-                            zj = par_loc[j*3+2]
-                            rj = par_size[j]
-
-                            dx = xj - xi
-                            dy = yj - yi
-                            dz = zj - zi
-                            dist_sq = dx*dx + dy*dy + dz*dz
-                            min_dist = (ri + rj) * min_separation
-
-                            if dist_sq < min_dist * min_dist:
-                                # Overlap detected
-                                if dist_sq > 1e-10:
-                                    dist = sqrt(dist_sq)
-                                else:
-                                    dist = 1e-5
-                                    dx = 1.0
-                                    dy = 0.0
-                                    dz = 0.0
-
-                                if iteration == 0:
-                                    initial_overlaps += 1
-                                overlaps_this_pass += 1
-
-                                # Push apart
-                                overlap = (min_dist - dist) * strength
-                                inv_dist = 1.0 / dist
-                                nx = dx * inv_dist
-                                ny = dy * inv_dist
-                                nz = dz * inv_dist
-
-                                par_loc[i*3] -= nx * overlap
-                                par_loc[i*3+1] -= ny * overlap
-                                par_loc[i*3+2] -= nz * overlap
-                                par_loc[j*3] += nx * overlap
-                                par_loc[j*3+1] += ny * overlap
-                                par_loc[j*3+2] += nz * overlap
-
-                                # Update local position for subsequent checks
-                                xi = par_loc[i*3]
-                                yi = par_loc[i*3+1]
-                                zi = par_loc[i*3+2]
-
-        if overlaps_this_pass == 0:
-            # Converged
-            free(cell_counts)
-            free(cell_starts)
-            free(particle_cells)
-            free(sorted_indices)
-            return (iteration + 1, initial_overlaps, 0)
-
-        final_overlaps = overlaps_this_pass
+                        cx = particle_cell[i*3]
+                        cy = particle_cell[i*3+1]
+                        cz = particle_cell[i*3+2]
+                        xi = par_loc[i*3]
+                        yi = par_loc[i*3+1]
+                        zi = par_loc[i*3+2]
+                        ri = par_size[i]
+
+                        # Check 3x3x3 neighborhood
+                        for ncx in range(cx - 1, cx + 2):
+                            for ncy in range(cy - 1, cy + 2):
+                                for ncz in range(cz - 1, cz + 2):
+                                    neighbor_bucket = <int>relax_cell_hash(ncx, ncy, ncz, mask)
+                                    start_idx = bucket_starts[neighbor_bucket]
+                                    end_idx = start_idx + bucket_counts[neighbor_bucket]
+
+                                    for neighbor_idx in range(start_idx, end_idx):
+                                        j = sorted_indices[neighbor_idx]
+
+                                        # Only process each pair once (j > i)
+                                        if j <= i:
+                                            continue
+                                        # Skip hash collisions from other cells
+                                        if particle_cell[j*3] != ncx or particle_cell[j*3+1] != ncy or particle_cell[j*3+2] != ncz:
+                                            continue
+
+                                        xj = par_loc[j*3]
+                                        yj = par_loc[j*3+1]
+                                        zj = par_loc[j*3+2]
+                                        rj = par_size[j]
+
+                                        dx = xj - xi
+                                        dy = yj - yi
+                                        dz = zj - zi
+                                        dist_sq = dx*dx + dy*dy + dz*dz
+                                        min_dist = (ri + rj) * min_separation
+
+                                        if dist_sq < min_dist * min_dist:
+                                            # Overlap detected
+                                            if dist_sq > 1e-10:
+                                                dist = sqrt(dist_sq)
+                                            else:
+                                                # Coincident: split along x (unit normal)
+                                                dist = 1e-5
+                                                dx = dist
+                                                dy = 0.0
+                                                dz = 0.0
+
+                                            overlaps_this_pass += 1
+
+                                            # Push apart
+                                            overlap = (min_dist - dist) * strength
+                                            inv_dist = 1.0 / dist
+                                            nx = dx * inv_dist
+                                            ny = dy * inv_dist
+                                            nz = dz * inv_dist
+
+                                            par_loc[i*3] -= nx * overlap
+                                            par_loc[i*3+1] -= ny * overlap
+                                            par_loc[i*3+2] -= nz * overlap
+                                            par_loc[j*3] += nx * overlap
+                                            par_loc[j*3+1] += ny * overlap
+                                            par_loc[j*3+2] += nz * overlap
+
+                                            # Update local position for subsequent checks
+                                            xi = par_loc[i*3]
+                                            yi = par_loc[i*3+1]
+                                            zi = par_loc[i*3+2]
+
+            if iteration == 0:
+                initial_overlaps = overlaps_this_pass
+
+            if overlaps_this_pass == 0:
+                # Converged
+                iterations_used = iteration + 1
+                final_overlaps = 0
+                break
+
+            final_overlaps = overlaps_this_pass
 
     # Clean up
-    free(cell_counts)
-    free(cell_starts)
-    free(particle_cells)
+    free(bucket_counts)
+    free(bucket_starts)
+    free(particle_buckets)
+    free(particle_cell)
+    free(particle_color)
     free(sorted_indices)
 
-    return (max_iterations, initial_overlaps, final_overlaps)
+    return (iterations_used, initial_overlaps, final_overlaps)
@@ -117,6 +117,8 @@ cdef Octree* Octree_create(int max_particles, float theta, float G, float soften
     tree.theta = theta
     tree.G = G
     tree.softening = softening
+    tree.theta2 = theta * theta
+    tree.softening2 = softening * softening
     return tree
 
 
@@ -195,47 +197,64 @@ cdef void Octree_insert(Octree *tree, OctreeNode *node, Particle *par,
                   node.children[octant].center[2], new_half, depth + 1)
 
 
-cdef void Octree_calculate_force_recursive(Octree *tree, OctreeNode *node, Particle *par,
-                                           float *force, int depth) noexcept nogil:
-    """Calculate gravitational force on particle from node (recursive Barnes-Hut)
+# Explicit traversal stack size: each expanded node pushes at most 8 children and
+# tree depth is capped at 51 by Octree_insert, so 7 * 51 + 8 pending nodes fit easily
+cdef enum:
+    BH_STACK_SIZE = 512
 
-    Depth limit prevents stack overflow on Windows (1MB default stack vs 8MB on macOS)
+
+cdef void Octree_calculate_force(Octree *tree, OctreeNode *root, Particle *par,
+                                 float *force) noexcept nogil:
+    """Calculate gravitational force on particle from tree (iterative Barnes-Hut)
+
+    Walks the tree with a fixed-size local stack instead of recursion, so there is
+    no per-node call overhead and no risk of overflowing the thread stack on Windows
+    (1MB default vs 8MB on macOS).
     """
-    # Depth limit to prevent stack overflow (matches Octree_insert limit)
-    if node == NULL or node.num_particles == 0 or depth > 50:
-        return
+    cdef OctreeNode *stack[BH_STACK_SIZE]
+    cdef int sp = 0
+    cdef OctreeNode *node
+    cdef float dx, dy, dz, dist_sq, size, inv_dist, force_mag
+    cdef int j
 
-    # Skip self (when leaf contains this particle)
-    if node.is_leaf and node.particle_id == par.id:
+    if root == NULL:
         return
 
-    cdef float dx = node.com[0] - par.loc[0]
-    cdef float dy = node.com[1] - par.loc[1]
-    cdef float dz = node.com[2] - par.loc[2]
-    cdef float dist_sq = dx*dx + dy*dy + dz*dz + tree.softening * tree.softening
-    cdef float dist = sqrt(dist_sq)
-    cdef float size = node.half_size * 2.0
-    cdef float force_mag
-    cdef int j
+    stack[0] = root
+    sp = 1
+
+    while sp > 0:
+        sp -= 1
+        node = stack[sp]
+
+        if node.num_particles == 0:
+            continue
+
+        # Skip self (when leaf contains this particle)
+        if node.is_leaf and node.particle_id == par.id:
+            continue
 
-    # Barnes-Hut criterion: if node is far enough, treat as single point mass
-    if node.is_leaf or (size / dist) < tree.theta:
-        # Compute acceleration: a = G * M / r^2 in direction of r
-        force_mag = tree.G * node.mass / dist_sq
-        force[0] += force_mag * dx / dist
-        force[1] += force_mag * dy / dist
-        force[2] += force_mag * dz / dist
-    else:
-        # Node is too close, recurse into children
-        for j in range(8):
-            if node.children[j] != NULL:
-                Octree_calculate_force_recursive(tree, node.children[j], par, force, depth + 1)
-
-
-cdef inline void Octree_calculate_force(Octree *tree, OctreeNode *node, Particle *par,
-                                        float *force) noexcept nogil:
-    """Wrapper for backward compatibility"""
-    Octree_calculate_force_recursive(tree, node, par, force, 0)
+        dx = node.com[0] - par.loc[0]
+        dy = node.com[1] - par.loc[1]
+        dz = node.com[2] - par.loc[2]
+        dist_sq = dx*dx + dy*dy + dz*dz + tree.softening2
+        size = node.half_size * 2.0
+
+        # Barnes-Hut criterion (size / dist < theta), squared to avoid sqrt/divide.
+        # Also treat as point mass if the stack cannot hold all 8 children.
+        if node.is_leaf or size * size < tree.theta2 * dist_sq or sp + 8 > BH_STACK_SIZE:
+            # Compute acceleration: a = G * M / r^2 in direction of r
+            inv_dist = 1.0 / sqrt(dist_sq)
+            force_mag = tree.G * node.mass * inv_dist * inv_dist * inv_dist
+            force[0] += force_mag * dx
+            force[1] += force_mag * dy
+            force[2] += force_mag * dz
+        else:
+            # Node is too close, descend into children
+            for j in range(8):
+                if node.children[j] != NULL:
+                    stack[sp] = node.children[j]
+                    sp += 1
 
 
 cdef void apply_barnes_hut_gravity(int num_threads) noexcept nogil:
@@ -165,3 +165,5 @@ cdef struct Octree:
     float theta             # Opening angle for Barnes-Hut (0.5-1.0)
     float G                 # Gravitational constant
     float softening         # Softening parameter to avoid singularities
+    float theta2            # theta squared (opening test without sqrt/divide)
+    float softening2        # softening squared
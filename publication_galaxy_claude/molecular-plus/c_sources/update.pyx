@@ -8,27 +8,35 @@ cdef void update(data):
 
     cdef int i = 0
     cdef int ii = 0
+    # Typed views of the exported NumPy buffers: element reads compile to
+    # plain C indexing instead of creating a Python scalar per access
+    cdef const float[::1] loc
+    cdef const float[::1] vel
+    cdef const short[::1] alive
 
     for i in range(psysnum):
         psys[i].selfcollision_active = data[i][3]
+        loc = data[i][0]
+        vel = data[i][1]
+        alive = data[i][2]
 
         for ii in range(psys[i].parnum):
 
             # Only read positions from Blender on first frame
             # After that, we maintain our own positions (CSV/simulated)
             if simulation_started == 0:
-                psys[i].particles[ii].loc[0] = data[i][0][(ii * 3)]
-                psys[i].particles[ii].loc[1] = data[i][0][(ii * 3) + 1]
-                psys[i].particles[ii].loc[2] = data[i][0][(ii * 3) + 2]
+                psys[i].particles[ii].loc[0] = loc[(ii * 3)]
+                psys[i].particles[ii].loc[1] = loc[(ii * 3) + 1]
+                psys[i].particles[ii].loc[2] = loc[(ii * 3) + 2]
             # Only read velocities from Blender on first frame
             # After that, we maintain our own velocities (Blender doesn't persist them)
             if simulation_started == 0:
-                psys[i].particles[ii].vel[0] = data[i][1][(ii * 3)]
-                psys[i].particles[ii].vel[1] = data[i][1][(ii * 3) + 1]
-                psys[i].particles[ii].vel[2] = data[i][1][(ii * 3) + 2]
+                psys[i].particles[ii].vel[0] = vel[(ii * 3)]
+                psys[i].particles[ii].vel[1] = vel[(ii * 3) + 1]
+                psys[i].particles[ii].vel[2] = vel[(ii * 3) + 2]
 
-            if psys[i].particles[ii].state == 3 and data[i][2][ii] == 3:
-                psys[i].particles[ii].state = data[i][2][ii] + 1
+            if psys[i].particles[ii].state == 3 and alive[ii] == 3:
+                psys[i].particles[ii].state = alive[ii] + 1
                 if psys[i].links_active == 1:
                     if psys[i].link_rellength == 1:
                         SpatialHash_query_neighbors(
@@ -48,11 +56,11 @@ cdef void update(data):
                     # free(psys[i].particles[ii].neighbours)
                     psys[i].particles[ii].neighboursnum = 0
 
-            elif psys[i].particles[ii].state == 4 and data[i][2][ii] == 3:
+            elif psys[i].particles[ii].state == 4 and alive[ii] == 3:
                 psys[i].particles[ii].state = 4
 
             else:
-                psys[i].particles[ii].state = data[i][2][ii]
+                psys[i].particles[ii].state = alive[ii]
 
             psys[i].particles[ii].collided_with = <int *>realloc(
                 psys[i].particles[ii].collided_with,
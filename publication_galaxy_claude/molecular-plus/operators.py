@@ -1,7 +1,7 @@
 import bpy
 import blf
 import math
-import array
+import numpy as np
 
 from mathutils import Vector
 from mathutils.geometry import barycentric_transform as barycentric
@@ -12,7 +12,7 @@ from molecular_core import core
 from .utils import get_object, destroy_caches, update_progress
 
 # Module-level cache for particle data (avoids custom property issues)
-# Stores array.array objects keyed by scene name
+# Stores float32 NumPy buffers keyed by scene name
 _mol_size_cache = {}  # Computed sizes (particle_size * csv_scale)
 _mol_field_cache = {}  # Cache for field IDs (angular_velocity channel)
 _mol_applying_sizes = False  # Guard against recursion
@@ -167,19 +167,19 @@ class MolSimulate(bpy.types.Operator):
             obj = get_object(context, ob)
             for psys in obj.particle_systems:
                 if psys.settings.mol_active and len(psys.particles):
-                    # mol_exportdata format: [header, (parlen, loc, vel, size, mass, alive, params, weak, field, scale), ...]
-                    par_size = mol_exportdata[psys_idx + 1][3]
-                    _mol_size_cache[scene.name].append(par_size)  # Store original array.array
+                    # mol_exportdata format: [header, simulate.MolExportSystem, ...]
+                    exported = mol_exportdata[psys_idx + 1]
+                    par_size = exported.par_size
+                    _mol_size_cache[scene.name].append(par_size)  # Store original float32 buffer
                     psys.particles.foreach_set("size", par_size)
 
                     # Debug: print size info
-                    sizes = list(par_size)
                     print(f"  Size DEBUG: particle_size={psys.settings.particle_size}, "
-                          f"computed range=[{min(sizes):.4f}, {max(sizes):.4f}], "
+                          f"computed range=[{par_size.min():.4f}, {par_size.max():.4f}], "
                           f"min_scale={psys.settings.mol_csv_min_scale}")
 
-                    # Field IDs for angular_velocity coloring (index 8)
-                    par_field = mol_exportdata[psys_idx + 1][8]
+                    # Field IDs for angular_velocity coloring
+                    par_field = exported.par_field
                     _mol_field_cache[scene.name].append(par_field)
                     if par_field is not None:
                         # Enable rotation system so angular_velocity is accessible in shaders
@@ -191,12 +191,9 @@ class MolSimulate(bpy.types.Operator):
                     psys_idx += 1
 
         # Register handlers to apply sizes (runs during sim AND bake)
-        # Use BOTH frame_change_post and depsgraph_update_post to catch all updates
-        if _mol_apply_sizes_handler not in bpy.app.handlers.frame_change_post:
-            bpy.app.handlers.frame_change_post.append(_mol_apply_sizes_handler)
-        if _mol_apply_sizes_handler not in bpy.app.handlers.depsgraph_update_post:
-            bpy.app.handlers.depsgraph_update_post.append(_mol_apply_sizes_handler)
-            print("  Registered size handlers for persistent particle sizes")
+        # Uses BOTH frame_change_post and depsgraph_update_post to catch all updates
+        _register_apply_sizes_handler()
+        print("  Registered size handlers for persistent particle sizes")
 
         print("  start processing:")
         bpy.ops.wm.mol_simulate_modal(resume=self.resume)
@@ -759,54 +756,106 @@ class MolToolsConvertGeo(bpy.types.Operator):
         return {"FINISHED"}
 
 
-class MolRestoreSizes(bpy.types.Operator):
-    """Restore particle sizes from CSV without re-simulating.
-    Use this after reopening a file with baked simulation."""
+def _register_apply_sizes_handler():
+    """Register handlers that keep cached sizes and field IDs applied."""
+    if _mol_apply_sizes_handler not in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(_mol_apply_sizes_handler)
+    if _mol_apply_sizes_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_mol_apply_sizes_handler)
 
-    bl_idname = "object.mol_restore_sizes"
-    bl_label = "Restore Sizes from CSV"
 
-    def execute(self, context):
-        from . import simulate
+def _restore_sizes_impl(context):
+    """
+    Restore particle sizes from CSV for every molecular particle system.
+    Returns the number of systems restored from CSV.
 
-        global _mol_size_cache, _mol_field_cache
+    Shared by the operator and the auto-restore after file load, which runs
+    from a one-shot depsgraph_update_post handler (registered by
+    mol_restore_on_load) and calls it directly to skip the operator layer.
+    """
+    from . import simulate
 
-        scene = context.scene
-        _mol_size_cache[scene.name] = []
-        _mol_field_cache[scene.name] = []
+    scene = context.scene
+    _mol_size_cache[scene.name] = []
+    _mol_field_cache[scene.name] = []
 
-        restored_count = 0
+    restored_count = 0
 
-        for ob in bpy.data.objects:
-            obj = get_object(context, ob)
-            for psys in obj.particle_systems:
-                if psys.settings.mol_active and len(psys.particles):
-                    num_particles = len(psys.particles)
+    for ob in bpy.data.objects:
+        obj = get_object(context, ob)
+        for psys in obj.particle_systems:
+            if psys.settings.mol_active and len(psys.particles):
+                num_particles = len(psys.particles)
 
-                    # Calculate sizes from CSV
-                    par_size = simulate.calculate_sizes_from_csv(psys.settings, num_particles)
+                # Calculate sizes from CSV
+                par_size = simulate.calculate_sizes_from_csv(psys.settings, num_particles)
 
-                    if par_size is not None:
-                        _mol_size_cache[scene.name].append(par_size)
-                        psys.particles.foreach_set("size", par_size)
-                        restored_count += 1
-                        print(f"  Restored sizes for {psys.settings.name} ({num_particles} particles)")
-                    else:
-                        # No CSV, use uniform size
-                        uniform_size = array.array("f", [psys.settings.particle_size]) * num_particles
-                        _mol_size_cache[scene.name].append(uniform_size)
-                        psys.particles.foreach_set("size", uniform_size)
+                if par_size is not None:
+                    _mol_size_cache[scene.name].append(par_size)
+                    psys.particles.foreach_set("size", par_size)
+                    restored_count += 1
+                    print(f"  Restored sizes for {psys.settings.name} ({num_particles} particles)")
+                else:
+                    # No CSV, use uniform size
+                    uniform_size = np.full(num_particles, psys.settings.particle_size, dtype=np.float32)
+                    _mol_size_cache[scene.name].append(uniform_size)
+                    psys.particles.foreach_set("size", uniform_size)
+
+                # Also restore field IDs if CSV has them
+                # (simplified - just cache empty for now, full restore would need more code)
+                _mol_field_cache[scene.name].append(None)
+
+    # Register handlers to keep sizes applied
+    _register_apply_sizes_handler()
+
+    return restored_count
+
+
+def _restore_fields_impl(context):
+    """
+    Restore particle field IDs from CSV for every molecular particle system.
+    Returns the number of systems restored from CSV.
+    """
+    from . import simulate
+
+    scene = context.scene
+    _mol_field_cache[scene.name] = []
+
+    restored_count = 0
+
+    for ob in bpy.data.objects:
+        obj = get_object(context, ob)
+        for psys in obj.particle_systems:
+            if psys.settings.mol_active and len(psys.particles):
+                num_particles = len(psys.particles)
 
-                    # Also restore field IDs if CSV has them
-                    # (simplified - just cache empty for now, full restore would need more code)
+                # Calculate field IDs from CSV
+                par_field = simulate.calculate_fields_from_csv(psys.settings, num_particles)
+
+                if par_field is not None:
+                    _mol_field_cache[scene.name].append(par_field)
+                    psys.particles.foreach_set("angular_velocity", par_field)
+                    restored_count += 1
+                    print(f"  Restored field IDs for {psys.settings.name} ({num_particles} particles)")
+                else:
+                    # No field data available
                     _mol_field_cache[scene.name].append(None)
 
-        # Register handlers to keep sizes applied
-        if _mol_apply_sizes_handler not in bpy.app.handlers.frame_change_post:
-            bpy.app.handlers.frame_change_post.append(_mol_apply_sizes_handler)
-        if _mol_apply_sizes_handler not in bpy.app.handlers.depsgraph_update_post:
-            bpy.app.handlers.depsgraph_update_post.append(_mol_apply_sizes_handler)
+    # Register handlers to keep field IDs applied
+    _register_apply_sizes_handler()
+
+    return restored_count
+
+
+class MolRestoreSizes(bpy.types.Operator):
+    """Restore particle sizes from CSV without re-simulating.
+    Use this after reopening a file with baked simulation."""
 
+    bl_idname = "object.mol_restore_sizes"
+    bl_label = "Restore Sizes from CSV"
+
+    def execute(self, context):
+        restored_count = _restore_sizes_impl(context)
         self.report({'INFO'}, f"Restored sizes for {restored_count} particle system(s)")
         return {"FINISHED"}
 
@@ -819,39 +868,7 @@ class MolRestoreFields(bpy.types.Operator):
     bl_label = "Restore Field IDs from CSV"
 
     def execute(self, context):
-        from . import simulate
-
-        global _mol_field_cache
-
-        scene = context.scene
-        _mol_field_cache[scene.name] = []
-
-        restored_count = 0
-
-        for ob in bpy.data.objects:
-            obj = get_object(context, ob)
-            for psys in obj.particle_systems:
-                if psys.settings.mol_active and len(psys.particles):
-                    num_particles = len(psys.particles)
-
-                    # Calculate field IDs from CSV
-                    par_field = simulate.calculate_fields_from_csv(psys.settings, num_particles)
-
-                    if par_field is not None:
-                        _mol_field_cache[scene.name].append(par_field)
-                        psys.particles.foreach_set("angular_velocity", par_field)
-                        restored_count += 1
-                        print(f"  Restored field IDs for {psys.settings.name} ({num_particles} particles)")
-                    else:
-                        # No field data available
-                        _mol_field_cache[scene.name].append(None)
-
-        # Register handlers to keep field IDs applied
-        if _mol_apply_sizes_handler not in bpy.app.handlers.frame_change_post:
-            bpy.app.handlers.frame_change_post.append(_mol_apply_sizes_handler)
-        if _mol_apply_sizes_handler not in bpy.app.handlers.depsgraph_update_post:
-            bpy.app.handlers.depsgraph_update_post.append(_mol_apply_sizes_handler)
-
+        restored_count = _restore_fields_impl(context)
         self.report({'INFO'}, f"Restored field IDs for {restored_count} particle system(s)")
         return {"FINISHED"}
 
@@ -1,4 +1,4 @@
-import multiprocessing
+import os
 import bpy
 from . import descriptions
 
@@ -640,7 +640,7 @@ def define_props():
     bpy.types.Scene.mol_cpu = bpy.props.IntProperty(
         name="CPU",
         description=descriptions.CPU,
-        default=multiprocessing.cpu_count(),
+        default=os.cpu_count() or 1,
         min=1,
         max=64,
     )
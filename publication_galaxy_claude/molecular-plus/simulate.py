@@ -1,10 +1,33 @@
 import bpy
-import array
+import collections
+import functools
+import mmap
 import numpy as np
+import operator
 import os
+import sys
+import types
+import warnings
+import zlib
 import csv as csv_module
+from concurrent.futures import ThreadPoolExecutor
+from molecular_core import core
 from .utils import get_object
 
+@functools.lru_cache(maxsize=None)
+def _get_pd():
+    """
+    Import pandas on first CSV load rather than at add-on startup (the import
+    alone costs a few hundred ms). Returns None if it is not installed:
+    pandas is not bundled with Blender, and CSV loading then falls back to
+    NumPy and the csv module.
+    """
+    try:
+        import pandas
+    except ImportError:
+        return None
+    return pandas
+
 
 # Field level 1 -> grouped ID mapping (sorted by field_level_0 FREQUENCY)
 # Most common categories first for better color distribution with blackbody ramp
@@ -53,82 +76,335 @@ GROUPED_FIELD_L1_IDS = {
     # Philosophy (283) - 0% of data
     "Theology": 283,
 }
+# Intern keys so lookups with interned row values hit the identity fast path,
+# and expose the table read-only so nothing can mutate the shared ID scheme
+GROUPED_FIELD_L1_IDS = types.MappingProxyType({sys.intern(k): v for k, v in GROUPED_FIELD_L1_IDS.items()})
 
 
-def calculate_sizes_from_csv(psys_settings, num_particles):
+# Absolute CSV paths, keyed by (blend file, path setting); '//' paths depend on both
+_CSV_PATH_CACHE = {}
+
+
+def _resolve_csv_path(csv_path):
     """
-    Calculate particle sizes from CSV file using current settings.
-    Returns array of sizes, or None if no CSV or error.
+    Return (absolute_path, exists) for a mol_initial_csv setting.
+    The abspath resolution is cached; existence is re-checked so a
+    file that was moved or deleted is still reported correctly.
+    """
+    key = (bpy.data.filepath, csv_path)
+    csv_path_abs = _CSV_PATH_CACHE.get(key)
+    if csv_path_abs is None:
+        csv_path_abs = _CSV_PATH_CACHE[key] = bpy.path.abspath(csv_path)
+    return csv_path_abs, os.path.exists(csv_path_abs)
 
-    This can be called independently to restore sizes without re-simulating.
+
+def _open_csv(csv_path_abs):
+    """Open a CSV for csv.reader: newline='' as the csv module expects, 1 MiB buffer."""
+    return open(csv_path_abs, newline='', buffering=1 << 20)
+
+
+def _parse_float_column(values):
+    """
+    Convert a list of CSV strings to a float64 array in one pass.
+    Empty or non-numeric cells become 0.0. Returns (array, any_valid).
+    """
+    try:
+        arr = np.array(values, dtype=np.float64)
+        return arr, len(arr) > 0
+    except ValueError:
+        pass
+
+    # Common case: the only bad cells are empty. One generator pass into a
+    # preallocated array, with no per-cell try/except or indexed stores
+    try:
+        arr = np.fromiter((float(v) if v else 0.0 for v in values), dtype=np.float64, count=len(values))
+        return arr, any(values)
+    except ValueError:
+        pass
+
+    # Slow path: some cells are malformed
+    arr = np.zeros(len(values), dtype=np.float64)
+    any_valid = False
+    for i, val in enumerate(values):
+        try:
+            if val and val.strip():
+                arr[i] = float(val)
+                any_valid = True
+        except (ValueError, TypeError):
+            pass
+    return arr, any_valid
+
+
+def _read_unquoted_columns(csv_path_abs, indices, max_rows):
+    """
+    Fast path for plain CSVs when pandas is unavailable.
+    If the file has no quote characters (so no embedded commas/newlines),
+    np.loadtxt tokenizes the requested column indices in C. Returns
+    (total_rows, [str array or None per index, truncated to max_rows]),
+    or None if the file needs csv.reader (quoted or ragged rows).
+    """
+    wanted = [i for i in indices if i >= 0]
+    if not wanted or os.path.getsize(csv_path_abs) == 0:
+        return None
+
+    # Scan for quotes without pulling the whole file into Python memory
+    with open(csv_path_abs, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'"') != -1:
+                return None
+
+    try:
+        with warnings.catch_warnings():
+            # Blank lines and header-only files only warn; both are handled
+            warnings.simplefilter('ignore')
+            table = np.loadtxt(
+                csv_path_abs, delimiter=',', skiprows=1, usecols=wanted,
+                dtype=str, ndmin=2, comments=None,
+            )
+    except ValueError:
+        return None
+
+    total_rows = len(table)
+    table = table[:max_rows]
+    return total_rows, [table[:, wanted.index(i)] if i >= 0 else None for i in indices]
+
+
+def _apply_scale_pipeline(raw_scale, min_scale, volume_mode, mult, out=None):
+    """
+    CSV scale pipeline: raw -> max(min_scale) -> cube root (VOLUME) -> * mult.
+    Works in place in float32 (the precision of the particle buffers it
+    feeds): in out if given, else in a new array. NaN cells fall back to
+    min_scale.
+    """
+    # Apply minimum scale (prevents zero-size), narrowing to float32 in the same pass
+    scaled = np.fmax(raw_scale, np.float32(min_scale), dtype=np.float32, out=out)
+    # Apply volume mode (cube root) if selected
+    if volume_mode:
+        np.cbrt(scaled, out=scaled)
+    # Apply global multiplier
+    scaled *= np.float32(mult)
+    return scaled
+
+
+def _field_ids_from_values(values, use_grouped_ids):
+    """
+    Map a column of CSV field strings to numeric field IDs.
+    Numeric cells are used as-is; string names get grouped IDs (field_level_1)
+    or first-seen IDs. Returns (ids float32 array, present mask, name->id dict).
+    """
+    arr = np.asarray(values, dtype=object)
+    present = arr != ''
+    ids = np.zeros(len(arr), dtype=np.float32)
+    field_to_id = {}
+    if not present.any():
+        return ids, present, field_to_id
+
+    # Numeric ID columns (e.g. field_id) convert in one C-level cast
+    try:
+        ids[present] = arr[present].astype(str).astype(np.float32)
+        return ids, present, field_to_id
+    except ValueError:
+        pass
+
+    # Factorize into codes + uniques in first-seen order
+    pd = _get_pd()
+    if pd is not None:
+        codes, uniques = pd.factorize(arr[present], sort=False)
+    else:
+        # dict.fromkeys keeps first-seen order and hashes in C; one mapped
+        # lookup per row then fills the codes (no O(n log n) string sort)
+        names = arr[present].tolist()
+        code_of = {name: code for code, name in enumerate(dict.fromkeys(names))}
+        uniques = list(code_of)
+        codes = np.fromiter(map(code_of.__getitem__, names), dtype=np.intp, count=len(names))
+
+    # Resolve an ID per unique name only; rows then gather from this small
+    # table and are cast to float32 in bulk, never boxed one at a time
+    unique_ids = np.empty(len(uniques), dtype=np.float32)
+    next_field_id = 0
+    for u, field_val in enumerate(uniques):
+        field_val = str(field_val)
+        try:
+            # Try numeric first
+            unique_ids[u] = float(field_val)
+        except ValueError:
+            # Use grouped mapping for field_level_1 to cluster related fields
+            grouped_id = GROUPED_FIELD_L1_IDS.get(field_val) if use_grouped_ids else None
+            if grouped_id is not None:
+                field_to_id[field_val] = grouped_id
+            else:
+                # Fallback to first-seen order for other columns or unknown fields
+                field_to_id[field_val] = next_field_id
+                next_field_id += 1
+            unique_ids[u] = field_to_id[field_val]
+
+    ids[present] = unique_ids[codes]
+    return ids, present, field_to_id
+
+
+# Column names tried in priority order when detecting CSV columns
+SCALE_CANDIDATES = ('scale', 'cited_by_count', 'total_citation_count', 'citation_count', 'citations')
+FIELD_CANDIDATES = ('field_level_0', 'field_level_1', 'field_level_2', 'mid_level', 'field', 'category', 'cluster')
+
+
+def _first_present(candidates, fieldnames):
+    """Return the first candidate column present in fieldnames (a set), or None."""
+    return next((c for c in candidates if c in fieldnames), None)
+
+
+# Columns detected from a CSV header; any entry may be None
+CsvColumns = collections.namedtuple('CsvColumns', 'x y z scale field')
+
+
+def _detect_columns(fieldnames, selected_level):
+    """
+    Detect every CSV column the add-on reads from one header.
+    Positions are generic (x, y, z) or tsne (tsne_x, tsne_y, tsne_z); z is
+    None for 2D data and x/y are None if neither naming is present.
+    Scale is generic or citation-based; field prefers field_id, then the
+    user-selected field_level_X, then any fallback.
+    """
+    column_set = set(fieldnames)
+    if 'x' in column_set:
+        x_col, y_col, z_col = 'x', 'y', 'z'
+    elif 'tsne_x' in column_set:
+        x_col, y_col, z_col = 'tsne_x', 'tsne_y', 'tsne_z'
+    else:
+        x_col = y_col = z_col = None
+    return CsvColumns(
+        x_col, y_col, z_col if z_col in column_set else None,
+        _first_present(SCALE_CANDIDATES, column_set),
+        _first_present(('field_id', f'field_level_{selected_level}') + FIELD_CANDIDATES, column_set),
+    )
+
+
+# Parsed scale/field columns, keyed by absolute CSV path -> (stamp, data).
+# Bounded: the oldest file is evicted once more than this many are cached.
+_CSV_DATA_CACHE = {}
+_CSV_DATA_CACHE_MAX = 8
+
+
+def _store_csv_particle_data(csv_path_abs, stamp, data):
+    """Cache parsed columns for csv_path_abs, evicting the oldest entries."""
+    _CSV_DATA_CACHE.pop(csv_path_abs, None)  # re-insert as newest
+    _CSV_DATA_CACHE[csv_path_abs] = (stamp, data)
+    while len(_CSV_DATA_CACHE) > _CSV_DATA_CACHE_MAX:
+        del _CSV_DATA_CACHE[next(iter(_CSV_DATA_CACHE))]
+
+
+def _csv_stamp(csv_path_abs, num_particles, selected_level):
+    """Cache key for parsed CSV columns: file identity plus what shapes the parse."""
+    st = os.stat(csv_path_abs)
+    return (st.st_mtime_ns, st.st_size, num_particles, selected_level)
+
+
+def _load_csv_particle_data(psys_settings, num_particles):
+    """
+    Read the scale and field columns of the particle system's CSV in one pass.
+    Returns a dict with 'scale_col', 'raw_scale', 'field_col' and 'field_ids'
+    (the _field_ids_from_values tuple), or None if there is no CSV.
+
+    Results are cached per file until its mtime/size, the particle count or
+    the selected field level change; pack_data seeds the cache with the
+    columns it parsed at initiate. Cached arrays must not be modified.
     """
     csv_path = psys_settings.mol_initial_csv
     if not csv_path:
         return None
 
-    csv_path_abs = bpy.path.abspath(csv_path)
-    if not os.path.exists(csv_path_abs):
+    csv_path_abs, exists = _resolve_csv_path(csv_path)
+    if not exists:
         print(f"  CSV file not found: {csv_path_abs}")
         return None
 
-    # Initialize sizes with default (particle_size * min_scale)
-    par_size = array.array("f", [psys_settings.particle_size * psys_settings.mol_csv_min_scale]) * num_particles
-
-    try:
-        with open(csv_path_abs) as f:
-            reader = csv_module.DictReader(f)
-            fieldnames = reader.fieldnames
-
-            # Detect scale column
-            scale_col = None
-            if 'scale' in fieldnames:
-                scale_col = 'scale'
-            elif 'cited_by_count' in fieldnames:
-                scale_col = 'cited_by_count'
-            elif 'total_citation_count' in fieldnames:
-                scale_col = 'total_citation_count'
-            elif 'citation_count' in fieldnames:
-                scale_col = 'citation_count'
-            elif 'citations' in fieldnames:
-                scale_col = 'citations'
-
-            if not scale_col:
-                print(f"  No scale column found in CSV")
-                return par_size  # Return default sizes
-
-            # Process rows
-            for idx, row in enumerate(reader):
-                if idx >= num_particles:
-                    break
-
-                # Get raw scale value
-                raw_scale = 0.0
-                try:
-                    val = row.get(scale_col, '')
-                    if val and val.strip():
-                        raw_scale = float(val)
-                except (ValueError, TypeError):
-                    pass
-
-                # Apply minimum scale
-                min_scale = psys_settings.mol_csv_min_scale
-                clamped_scale = max(min_scale, raw_scale)
-
-                # Apply volume mode (cube root) if selected
-                if psys_settings.mol_csv_scale_mode == 'VOLUME':
-                    effective_scale = clamped_scale ** (1.0 / 3.0)
-                else:
-                    effective_scale = clamped_scale
+    selected_level = psys_settings.mol_csv_field_level
+    stamp = _csv_stamp(csv_path_abs, num_particles, selected_level)
+    cached = _CSV_DATA_CACHE.get(csv_path_abs)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with _open_csv(csv_path_abs) as f:
+        reader = csv_module.reader(f)
+        fieldnames = next(reader, None) or []
+        columns = _detect_columns(fieldnames, selected_level)
+        scale_col, field_col = columns.scale, columns.field
+
+        # Collect raw strings for both columns (blank lines skipped, as DictReader did)
+        si = fieldnames.index(scale_col) if scale_col else -1
+        fi = fieldnames.index(field_col) if field_col else -1
+        scales, fields = [], []
+        raw_scale = None
+        pd = _get_pd()
+        if pd is not None and (si >= 0 or fi >= 0):
+            # C-level parse of just these columns, as in _read_initial_csv
+            df = pd.read_csv(
+                csv_path_abs,
+                usecols=[c for c in (scale_col, field_col) if c],
+                dtype={field_col: str} if field_col else None,
+                keep_default_na=False,
+                na_values=[''],
+                nrows=num_particles,
+            )
+            if scale_col:
+                raw_scale = pd.to_numeric(df[scale_col], errors='coerce').to_numpy(np.float64)
+                raw_scale[np.isnan(raw_scale)] = 0.0
+            if field_col:
+                fields = df[field_col].fillna('').tolist()
+        else:
+            fast = _read_unquoted_columns(csv_path_abs, (si, fi), num_particles)
+            if fast is not None:
+                _, (scales, fields) = fast
+            elif si >= 0 or fi >= 0:
+                for idx, row in enumerate(r for r in reader if r):
+                    if idx >= num_particles:
+                        break
+                    if si >= 0:
+                        scales.append(row[si] if si < len(row) else '')
+                    if fi >= 0:
+                        fields.append(row[fi] if fi < len(row) else '')
+        if scale_col and raw_scale is None:
+            raw_scale = _parse_float_column(scales)[0]
+
+    data = {
+        'scale_col': scale_col,
+        'raw_scale': raw_scale,
+        'field_col': field_col,
+        'field_ids': _field_ids_from_values(fields, field_col == 'field_level_1') if field_col else None,
+    }
+    _store_csv_particle_data(csv_path_abs, stamp, data)
+    return data
 
-                # Apply global multiplier
-                global_mult = psys_settings.mol_csv_scale_multiplier
-                final_scale = effective_scale * global_mult
 
-                # Calculate final size
-                par_size[idx] = psys_settings.particle_size * final_scale
+def calculate_sizes_from_csv(psys_settings, num_particles):
+    """
+    Calculate particle sizes from CSV file using current settings.
+    Returns array of sizes, or None if no CSV or error.
 
-        sizes = list(par_size)
-        print(f"  CSV sizes restored: range [{min(sizes):.6f}, {max(sizes):.6f}]")
+    This can be called independently to restore sizes without re-simulating.
+    """
+    try:
+        data = _load_csv_particle_data(psys_settings, num_particles)
+        if data is None:
+            return None
+
+        # Initialize sizes with default (particle_size * min_scale)
+        par_size = np.full(num_particles, psys_settings.particle_size * psys_settings.mol_csv_min_scale, dtype=np.float32)
+
+        if not data['scale_col']:
+            print(f"  No scale column found in CSV")
+            return par_size  # Return default sizes
+
+        # Clamp, volume mode, then global multiplier and particle size,
+        # written straight into the size buffer
+        raw_scale = data['raw_scale']
+        _apply_scale_pipeline(
+            raw_scale,
+            psys_settings.mol_csv_min_scale,
+            psys_settings.mol_csv_scale_mode == 'VOLUME',
+            psys_settings.mol_csv_scale_multiplier * psys_settings.particle_size,
+            out=par_size[:len(raw_scale)],
+        )
+        print(f"  CSV sizes restored: range [{par_size.min():.6f}, {par_size.max():.6f}]")
         return par_size
 
     except Exception as e:
@@ -144,87 +420,24 @@ def calculate_fields_from_csv(psys_settings, num_particles):
 
     This can be called independently to restore field colors without re-simulating.
     """
-    csv_path = psys_settings.mol_initial_csv
-    if not csv_path:
-        return None
-
-    csv_path_abs = bpy.path.abspath(csv_path)
-    if not os.path.exists(csv_path_abs):
-        print(f"  CSV file not found: {csv_path_abs}")
-        return None
+    try:
+        data = _load_csv_particle_data(psys_settings, num_particles)
+        if data is None:
+            return None
 
-    # Initialize field array (3 components per particle: field_id, 0, 0)
-    par_field = array.array("f", [0.0, 0.0, 0.0]) * num_particles
+        field_col = data['field_col']
+        if not field_col:
+            print(f"  No field column found in CSV")
+            return None
 
-    try:
-        with open(csv_path_abs) as f:
-            reader = csv_module.DictReader(f)
-            fieldnames = reader.fieldnames
-
-            # Detect field/category column for coloring
-            # Use user-selected field level if available
-            field_col = None
-            if 'field_id' in fieldnames:
-                field_col = 'field_id'
-            else:
-                # Check for field_level_X based on user selection
-                selected_level = psys_settings.mol_csv_field_level
-                level_col = f'field_level_{selected_level}'
-                if level_col in fieldnames:
-                    field_col = level_col
-                # Fallback to any available field_level
-                elif 'field_level_0' in fieldnames:
-                    field_col = 'field_level_0'
-                elif 'field_level_1' in fieldnames:
-                    field_col = 'field_level_1'
-                elif 'field_level_2' in fieldnames:
-                    field_col = 'field_level_2'
-                elif 'mid_level' in fieldnames:
-                    field_col = 'mid_level'
-                elif 'field' in fieldnames:
-                    field_col = 'field'
-                elif 'category' in fieldnames:
-                    field_col = 'category'
-                elif 'cluster' in fieldnames:
-                    field_col = 'cluster'
-
-            if not field_col:
-                print(f"  No field column found in CSV")
-                return None
+        # Initialize field array (3 components per particle: field_id, 0, 0)
+        par_field = np.zeros(num_particles * 3, dtype=np.float32)
 
-            # Build field name to ID mapping (for string fields like "Medicine")
-            field_to_id = {}
-            next_field_id = 0
-            fields_set = 0
-
-            # Process rows
-            for idx, row in enumerate(reader):
-                if idx >= num_particles:
-                    break
-
-                if row.get(field_col):
-                    field_val = row[field_col]
-                    try:
-                        # Try numeric first
-                        field_id = float(field_val)
-                    except (ValueError, TypeError):
-                        # String field name - convert to ID
-                        # Use grouped mapping for field_level_1 to cluster related fields
-                        if field_col == 'field_level_1' and field_val in GROUPED_FIELD_L1_IDS:
-                            field_id = float(GROUPED_FIELD_L1_IDS[field_val])
-                            if field_val not in field_to_id:
-                                field_to_id[field_val] = GROUPED_FIELD_L1_IDS[field_val]
-                        else:
-                            # Fallback to first-seen order for other columns or unknown fields
-                            if field_val not in field_to_id:
-                                field_to_id[field_val] = next_field_id
-                                next_field_id += 1
-                            field_id = float(field_to_id[field_val])
-
-                    par_field[idx * 3] = field_id
-                    par_field[idx * 3 + 1] = 0.0  # Y unused
-                    par_field[idx * 3 + 2] = 0.0  # Z unused
-                    fields_set += 1
+        ids, present, field_to_id = data['field_ids']
+        # Buffer is pre-zeroed and ids is 0 where the cell was empty, so one
+        # strided store into X suffices; Y/Z are never written
+        par_field.reshape(-1, 3)[:len(ids), 0] = ids
+        fields_set = int(present.sum())
 
         # Print field name to ID mapping if string fields were converted
         if field_to_id:
@@ -244,29 +457,37 @@ def relax_particle_overlaps(par_loc, par_size, max_iterations=100, min_separatio
     """
     Push overlapping particles apart until no overlaps remain.
     Calls into Cython spatial-hash implementation for O(n) performance.
+
+    par_loc and par_size may be any contiguous float32 buffer (NumPy or
+    array.array); the Cython memoryviews wrap them without copying.
     """
-    from molecular_core import core
+    if len(par_size) < 2:
+        return (0, 0, 0)
     return core.relax_overlaps(par_loc, par_size, max_iterations, min_separation, strength, num_threads)
 
 
 def get_gn_float_attr(obj, mod_name, attr_name, weak_map):
-    # Find target modifier index
-    for target_idx, mod in enumerate(obj.modifiers):
-        if mod.name == mod_name:
-            break
-    else:
+    """
+    Read a FLOAT attribute from obj evaluated up to (and including) the named
+    modifier into weak_map. Returns True if later modifiers were temporarily
+    disabled, i.e. the caller must re-evaluate obj before using its particles.
+    """
+    # Find target modifier index (name lookup in C, no Python scan)
+    target_idx = obj.modifiers.find(mod_name)
+    if target_idx < 0:
         raise ValueError(f"Modifier '{mod_name}' not found")
 
-    print("start bake weakmap from geo nodes: ", mod.name)
+    print("start bake weakmap from geo nodes: ", mod_name)
 
-    # Temporarily disable modifiers after target
-    orig_states = [(mod, mod.show_viewport) for mod in obj.modifiers[target_idx + 1 :]]
+    # Temporarily disable modifiers after target (only those still enabled)
+    orig_states = [(mod, True) for mod in obj.modifiers[target_idx + 1 :] if mod.show_viewport]
     for mod, _ in orig_states:
         mod.show_viewport = False
 
-    # Force depsgraph to re-evaluate without those modifiers
-    obj.update_tag()  # ← Critical!
-    bpy.context.view_layer.update()
+    # Tag for re-evaluation only if something actually changed;
+    # evaluated_depsgraph_get() below then updates just what was tagged
+    if orig_states:
+        obj.update_tag()  # ← Critical!
 
     try:
         # Evaluate and read FLOAT attribute directly into weak_map
@@ -275,6 +496,12 @@ def get_gn_float_attr(obj, mod_name, attr_name, weak_map):
         mesh = eval_obj.data
 
         attr = mesh.attributes.get(attr_name)
+        # foreach_get copies straight into the float32 buffer, which needs
+        # a FLOAT attribute of exactly the buffer's length
+        if attr is None:
+            raise ValueError(f"Attribute '{attr_name}' not found on '{obj.name}'")
+        if attr.data_type != 'FLOAT':
+            raise ValueError(f"Attribute '{attr_name}' is {attr.data_type}, expected FLOAT")
 
         print("attributes: " + str(len(attr.data)))
         print("np_array: " + str(len(weak_map)))
@@ -288,29 +515,406 @@ def get_gn_float_attr(obj, mod_name, attr_name, weak_map):
         for mod, state in orig_states:
             mod.show_viewport = state
 
+    return bool(orig_states)
+
 
 def get_weak_map(obj, psys, par_weak):
     print("start bake weakmap from:", obj.name)
 
-    tex = psys.settings.texture_slots[0].texture
-    texm_offset = psys.settings.texture_slots[0].offset
-    texm_scale = psys.settings.texture_slots[0].scale
+    settings = psys.settings
+    tex_slot = settings.texture_slots[0]
+    tex = tex_slot.texture
+    texm_offset = tex_slot.offset
+    texm_scale = tex_slot.scale
     parlen = len(psys.particles)
-    colramp = tex.color_ramp
+    use_color_ramp = tex.use_color_ramp
+    invert = settings.mol_inv_weak_map
+    # Bound methods resolved once, outside the per-particle loop
+    tex_evaluate = tex.evaluate
+    ramp_evaluate = tex.color_ramp.evaluate
+
+    # Bulk-fetch locations and transform them all at once.
+    # Matches mathutils (loc + offset) @ matrix_world * scale: row vector
+    # with implicit w=1 times the 4x4, then a per-axis scale.
+    locs = np.empty(parlen * 3, dtype=np.float32)
+    psys.particles.foreach_get("location", locs)
+    mat = np.array(obj.matrix_world, dtype=np.float32)
+    uvs = (locs.reshape(-1, 3) + np.asarray(texm_offset, dtype=np.float32)) @ mat[:3, :3]
+    uvs += mat[3, :3]
+    uvs *= np.asarray(texm_scale, dtype=np.float32)
+
+    # Only the texture lookup itself still runs per particle
+    if use_color_ramp:
+        weaks = [ramp_evaluate(tex_evaluate(newuv)[0])[0] for newuv in uvs.tolist()]
+    else:
+        weaks = [tex_evaluate(newuv)[0] for newuv in uvs.tolist()]
 
-    for i in range(parlen):
-        newuv = (
-            (psys.particles[i].location + texm_offset) @ obj.matrix_world * texm_scale
-        )
-        if tex.use_color_ramp:
-            par_weak[i] = colramp.evaluate(tex.evaluate(newuv)[0])[0]
+    # One bulk store into the float32 buffer
+    par_weak[:] = weaks
+    if invert:
+        np.subtract(1.0, par_weak, out=par_weak)
+
+    print("Weakmap baked on:", settings.name)
+
+
+# Shared all-ones weak buffer, grown on demand. Read-only, so every system
+# without a weak map can export a view of it at once.
+_WEAK_ONES = np.ones(0, dtype=np.float32)
+
+
+def _ones_view(n):
+    """Return a read-only float32 view of n ones."""
+    global _WEAK_ONES
+    if _WEAK_ONES.size < n:
+        _WEAK_ONES = np.ones(n, dtype=np.float32)
+        _WEAK_ONES.flags.writeable = False
+    return _WEAK_ONES[:n]
+
+
+# Masses from the previous initiate, keyed by (object name, psys index) -> (signature, par_mass)
+_MASS_CACHE = {}
+
+
+def get_particle_masses(key, psys_settings, par_size):
+    """
+    Return the float32 mass buffer for a particle system, reusing the last
+    one while the mass settings and (in density mode) the sizes are unchanged.
+    The core copies masses into its own structs, so the cached buffer is
+    never written after it is built.
+    """
+    parlen = len(par_size)
+    if psys_settings.mol_density_active:
+        density = psys_settings.mol_density
+        # CRC32 straight over the buffer (no bytes copy); a false match
+        # between two different size sets has odds of about 2**-32
+        sig = (parlen, True, density, zlib.crc32(memoryview(par_size).cast('B')))
+    else:
+        mass = psys_settings.mass
+        sig = (parlen, False, mass)
+
+    cached = _MASS_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    par_mass = np.empty(parlen, dtype=np.float32)
+    if sig[1]:
+        # mass = density * 4/3*pi*(size/2)^3 = density * pi/6 * size^3,
+        # computed in place in the float32 buffer; the prefactor is folded
+        # into one float32 scalar so nothing is promoted to float64, and the
+        # cube is two multiplies rather than a generic pow()
+        np.multiply(par_size, np.float32(density * (np.pi / 6.0)), out=par_mass)
+        par_mass *= par_size
+        par_mass *= par_size
+    else:
+        par_mass.fill(mass)
+
+    _MASS_CACHE[key] = (sig, par_mass)
+    return par_mass
+
+
+# Per-system entries of mol_exportdata. The core unpacks these positionally
+# (c_sources/init.pyx, simulate.pyx); Python consumers use the field names.
+class MolExportSystem(collections.namedtuple(
+    "MolExportSystem",
+    "parlen par_loc par_vel par_size par_mass par_alive params par_weak par_field par_scale",
+)):
+    __slots__ = ()
+
+    # par_loc/par_vel are exported xyz-interleaved (AoS) because the core
+    # indexes them that way. Kernels that want one contiguous array per axis
+    # can take an SoA copy here; it is built on demand, after relaxation has
+    # moved par_loc, so it is never stale.
+    def loc_soa(self):
+        """Return positions as a contiguous (3, parlen) float32 array: x, y, z rows."""
+        return np.ascontiguousarray(self.par_loc.reshape(-1, 3).T)
+
+    def vel_soa(self):
+        """Return velocities as a contiguous (3, parlen) float32 array: x, y, z rows."""
+        return np.ascontiguousarray(self.par_vel.reshape(-1, 3).T)
+
+
+MolExportFrame = collections.namedtuple("MolExportFrame", "par_loc par_vel par_alive self_coll")
+
+
+# (destination, source) suffixes copied by the mol_link/mol_relink "same value" toggles
+LINK_SAMEVALUE_PAIRS = (
+    ("estiff", "stiff"),
+    ("estiffrand", "stiffrand"),
+    ("estiffexp", "stiffexp"),
+    ("edamp", "damp"),
+    ("edamprand", "damprand"),
+    ("ebroken", "broken"),
+    ("ebrokenrand", "brokenrand"),
+)
+
+
+# Particle-settings attributes packed into mol_exportdata params, by index.
+# The core reads these positionally (c_sources/init.pyx), so order matters.
+MOL_PARAM_NAMES = (
+    'mol_selfcollision_active',  # 0
+    'mol_othercollision_active',  # 1
+    'mol_collision_group',  # 2
+    'mol_friction',  # 3
+    'mol_collision_damp',  # 4
+    'mol_links_active',  # 5
+    'mol_link_length',  # 6
+    'mol_link_max',  # 7
+    'mol_link_tension',  # 8
+    'mol_link_tensionrand',  # 9
+    'mol_link_stiff',  # 10
+    'mol_link_stiffrand',  # 11
+    'mol_link_stiffexp',  # 12
+    'mol_link_damp',  # 13
+    'mol_link_damprand',  # 14
+    'mol_link_broken',  # 15
+    'mol_link_brokenrand',  # 16
+    'mol_link_estiff',  # 17
+    'mol_link_estiffrand',  # 18
+    'mol_link_estiffexp',  # 19
+    'mol_link_edamp',  # 20
+    'mol_link_edamprand',  # 21
+    'mol_link_ebroken',  # 22
+    'mol_link_ebrokenrand',  # 23
+    'mol_relink_group',  # 24
+    'mol_relink_chance',  # 25
+    'mol_relink_chancerand',  # 26
+    'mol_relink_max',  # 27
+    'mol_relink_tension',  # 28
+    'mol_relink_tensionrand',  # 29
+    'mol_relink_stiff',  # 30
+    'mol_relink_stiffexp',  # 31
+    'mol_relink_stiffrand',  # 32
+    'mol_relink_damp',  # 33
+    'mol_relink_damprand',  # 34
+    'mol_relink_broken',  # 35
+    'mol_relink_brokenrand',  # 36
+    'mol_relink_estiff',  # 37
+    'mol_relink_estiffexp',  # 38
+    'mol_relink_estiffrand',  # 39
+    'mol_relink_edamp',  # 40
+    'mol_relink_edamprand',  # 41
+    'mol_relink_ebroken',  # 42
+    'mol_relink_ebrokenrand',  # 43
+    'mol_link_friction',  # 44
+    'mol_link_group',  # 45
+    'mol_other_link_active',  # 46
+    'mol_link_rellength',  # 47
+    'mol_collision_adhesion_search_distance',  # 48
+    'mol_collision_adhesion_factor',  # 49
+    'mol_gravity_active',  # 50 Gravity (Barnes-Hut)
+    'mol_gravity_strength',  # 51
+    'mol_gravity_theta',  # 52
+    'mol_gravity_softening',  # 53
+    'mol_gravity_initial_rotation',  # 54
+    'mol_gravity_rotation_falloff',  # 55
+)
+
+# One C-level getter for all params: a single call returns the whole tuple
+_get_mol_params = operator.attrgetter(*MOL_PARAM_NAMES)
+
+
+def _read_initial_csv(csv_path_abs, parlen, selected_level):
+    """
+    Read initial positions, raw scales and field IDs from a CSV.
+    Pure file I/O and NumPy (no bpy access), so it is safe to run on a worker
+    thread. Returns a dict consumed by pack_data.
+    """
+    data = {
+        'csv_rows': 0, 'is_2d': False, 'z_col': None, 'positions': None,
+        'raw_scale': None, 'has_scale': False,
+        'field_col': None, 'field_ids': None, 'has_field': False, 'field_to_id': {},
+        'scale_col': None, 'field_present': None,
+    }
+    csv_rows = 0
+    with _open_csv(csv_path_abs) as f:
+        reader = csv_module.reader(f)
+        # Detect column names from header row
+        fieldnames = next(reader, None)
+        # Positions (x,y,z or tsne_x,tsne_y,tsne_z), scale and field columns;
+        # the field column honours the user-selected field level
+        x_col, y_col, z_col, scale_col, field_col = _detect_columns(fieldnames, selected_level)
+        if x_col is None:
+            print(f"  CSV Warning: No recognized position columns (x,y,z or tsne_x,tsne_y,tsne_z)")
+            return data
+
+        xs, ys, zs, fields = [], [], [], []
+        raw_scale = None
+        has_scale = False
+        pd = _get_pd()
+        if pd is not None:
+            # C-level parse of just the columns we need
+            df = pd.read_csv(
+                csv_path_abs,
+                usecols=[c for c in (x_col, y_col, z_col, scale_col, field_col) if c],
+                dtype={field_col: str} if field_col else None,
+                keep_default_na=False,
+                na_values=[''],
+            )
+            csv_rows = len(df)
+            df = df.iloc[:parlen]
+            xs = df[x_col].to_numpy(np.float32)
+            ys = df[y_col].to_numpy(np.float32)
+            if z_col:
+                zs = df[z_col].to_numpy(np.float32)
+            if scale_col:
+                raw_scale = pd.to_numeric(df[scale_col], errors='coerce').to_numpy(np.float64)
+                valid = ~np.isnan(raw_scale)
+                has_scale = bool(valid.any())
+                raw_scale[~valid] = 0.0
+            if field_col:
+                fields = df[field_col].fillna('').tolist()
         else:
-            par_weak[i] = tex.evaluate(newuv)[0]
+            # Resolve column positions once; rows are plain lists
+            xi = fieldnames.index(x_col)
+            yi = fieldnames.index(y_col)
+            zi = fieldnames.index(z_col) if z_col else -1
+            si = fieldnames.index(scale_col) if scale_col else -1
+            fi = fieldnames.index(field_col) if field_col else -1
+
+            # Collect raw column strings, convert in bulk below
+            scales = []
+            fast = _read_unquoted_columns(csv_path_abs, (xi, yi, zi, si, fi), parlen)
+            if fast is not None:
+                csv_rows, (xs, ys, zs, scales, fields) = fast
+            else:
+                for idx, row in enumerate(r for r in reader if r):
+                    csv_rows += 1
+                    if idx >= parlen:
+                        continue  # Count all rows but only use up to parlen
+                    xs.append(row[xi])
+                    ys.append(row[yi])
+                    if zi >= 0:
+                        zs.append(row[zi])
+                    if si >= 0:
+                        scales.append(row[si] if si < len(row) else '')
+                    if fi >= 0:
+                        fields.append(row[fi] if fi < len(row) else '')
+            if scale_col:
+                raw_scale, has_scale = _parse_float_column(scales)
+
+    data['csv_rows'] = csv_rows
+    data['is_2d'] = z_col is None
+    data['z_col'] = z_col
+    # Interleave x, y, z here on the worker so pack_data does a single
+    # contiguous copy into par_loc; 2D files get z = 0
+    positions = np.empty((len(xs), 3), dtype=np.float32)
+    positions[:, 0] = xs
+    positions[:, 1] = ys
+    positions[:, 2] = zs if z_col else 0.0
+    data['positions'] = positions
+    data['raw_scale'] = raw_scale
+    data['has_scale'] = has_scale
+    data['scale_col'] = scale_col
+
+    # Convert string field names to numeric IDs
+    if field_col:
+        ids, present, field_to_id = _field_ids_from_values(fields, field_col == 'field_level_1')
+        data['field_col'] = field_col
+        data['field_ids'] = ids
+        data['field_present'] = present
+        data['has_field'] = bool(present.any())
+        data['field_to_id'] = field_to_id
+    return data
+
+
+def _prefetch_initial_csvs(context):
+    """
+    Read every active particle system's initial CSV up front.
+    Settings are read here on the main thread (RNA is not thread-safe); the
+    independent file parses then run on a small thread pool, which overlaps
+    I/O and the GIL-free parts of NumPy/pandas parsing.
+    Returns {(object name, psys index): (csv_path_abs, data)}.
+    """
+    jobs = {}
+    for ob in bpy.data.objects:
+        obj = get_object(context, ob)
+        for i, psys in enumerate(obj.particle_systems):
+            psys_settings = ob.particle_systems[i].settings
+            parlen = len(psys.particles)
+            csv_path = psys_settings.mol_initial_csv
+            if not (psys_settings.mol_active and parlen and csv_path):
+                continue
+            csv_path_abs, csv_exists = _resolve_csv_path(csv_path)
+            if csv_exists:
+                jobs[(ob.name, i)] = (csv_path_abs, parlen, psys_settings.mol_csv_field_level)
+
+    # Systems reading the same file with the same shape share one parse;
+    # stamps are taken before reading so a file edited mid-parse re-reads later
+    unique = dict.fromkeys(jobs.values())
+    stamps = {args: _csv_stamp(*args) for args in unique}
+    if len(unique) < 2:
+        parsed = {args: _read_initial_csv(*args) for args in unique}
+    else:
+        with ThreadPoolExecutor(max_workers=min(4, len(unique))) as pool:
+            futures = {args: pool.submit(_read_initial_csv, *args) for args in unique}
+        parsed = {args: future.result() for args, future in futures.items()}
+
+    # Seed the restore-path cache so calculate_sizes_from_csv and
+    # calculate_fields_from_csv reuse these columns instead of re-parsing
+    for args, data in parsed.items():
+        if data['positions'] is not None:
+            _store_csv_particle_data(args[0], stamps[args], {
+                'scale_col': data['scale_col'],
+                'raw_scale': data['raw_scale'],
+                'field_col': data['field_col'],
+                'field_ids': (data['field_ids'], data['field_present'], data['field_to_id']) if data['field_col'] else None,
+            })
+
+    return {key: (args[0], parsed[args]) for key, args in jobs.items()}
+
+
+# Per-frame loc|vel and alive buffers by (object name, psys index). core.simulate
+# copies them into its own particle structs and keeps no reference, so the
+# same buffers are refilled every frame instead of reallocated.
+_FRAME_BUFFERS = {}
 
-        if psys.settings.mol_inv_weak_map:
-            par_weak[i] = 1 - par_weak[i]
 
-    print("Weakmap baked on:", psys.settings.name)
+def _frame_buffers(key, parlen):
+    """Return the reusable (loc|vel float32, alive int16) buffers for a system."""
+    bufs = _FRAME_BUFFERS.get(key)
+    if bufs is None or len(bufs[1]) != parlen:
+        bufs = (np.empty(parlen * 6, dtype=np.float32), np.empty(parlen, dtype=np.int16))
+        _FRAME_BUFFERS[key] = bufs
+    return bufs
+
+
+def _run_relaxations(jobs, num_threads):
+    """
+    Relax overlaps for each (name, par_loc, par_size, iterations, separation,
+    strength) job. Only NumPy buffers and plain values reach the workers and
+    the kernel runs without the GIL, so independent systems relax
+    concurrently, splitting the mol_cpu thread budget between them.
+    """
+    if len(jobs) < 2:
+        threads_each = num_threads
+    else:
+        threads_each = max(1, num_threads // len(jobs))
+
+    def relax(job):
+        name, par_loc, par_size, iterations, separation, strength = job
+        return relax_particle_overlaps(
+            par_loc,
+            par_size,
+            max_iterations=iterations,
+            min_separation=separation,
+            strength=strength,
+            num_threads=threads_each,
+        )
+
+    if len(jobs) < 2:
+        results = [relax(jobs[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), num_threads))) as pool:
+            results = list(pool.map(relax, jobs))
+
+    for job, (iters, initial, final) in zip(jobs, results):
+        if initial > 0:
+            if final == 0:
+                print(f"  Relaxation ({job[0]}): {initial} overlaps resolved in {iters} iterations")
+            else:
+                print(f"  Relaxation ({job[0]}): {initial} initial overlaps, {final} remaining after {iters} iterations (increase iterations)")
+        else:
+            print(f"  Relaxation ({job[0]}): no overlaps detected")
 
 
 def pack_data(context, initiate):
@@ -318,9 +922,42 @@ def pack_data(context, initiate):
     parnum = 0
     scene = context.scene
 
+    # Same frame duration for every particle system
+    if scene.timescale != 1.0:
+        timestep = 1 / (scene.render.fps / scene.timescale)
+    else:
+        timestep = 1 / scene.render.fps
+
+    # Initial-state CSVs are parsed up front, in parallel across particle systems
+    csv_prefetch = _prefetch_initial_csvs(context) if initiate else {}
+    relax_jobs = []
+    mol_exportdata = scene.mol_exportdata
+    if initiate:
+        _FRAME_BUFFERS.clear()  # drop buffers of systems from a previous run
+
     for ob in bpy.data.objects:
         obj = get_object(context, ob)  # Evaluated object (for particle positions)
 
+        # Geometry-nodes weak map: the attribute lives on the object's mesh, so
+        # bake it once per object before the particle loop. At most one
+        # depsgraph re-evaluation per object, and none if nothing was toggled.
+        geo_weak_map = None
+        if initiate:
+            geo_parlen = [
+                len(psys.particles)
+                for i, psys in enumerate(obj.particle_systems)
+                if ob.particle_systems[i].settings.mol_active
+                and ob.particle_systems[i].settings.mol_bake_weak_map_geo
+                and len(psys.particles)
+            ]
+            if geo_parlen:
+                geo_weak_map = np.empty(geo_parlen[0], dtype=np.float32)
+                if get_gn_float_attr(ob, "M+ weak map", "weak_map", geo_weak_map):
+                    # Force depsgraph to re-evaluate with modifiers reenabled
+                    ob.update_tag()  # ← Critical!
+                    bpy.context.view_layer.update()
+                    obj = get_object(context, ob)
+
         for i, psys in enumerate(obj.particle_systems):
             # IMPORTANT: Use settings from ORIGINAL object, not evaluated
             # The evaluated object's settings are a stale copy that doesn't update
@@ -332,10 +969,20 @@ def pack_data(context, initiate):
             parlen = len(psys.particles)
 
             if psys_settings.mol_active and parlen:
-                par_loc = array.array("f", [0, 0, 0]) * parlen
-                par_vel = array.array("f", [0, 0, 0]) * parlen
-                par_size = array.array("f", [0]) * parlen
-                par_alive = array.array("h", [0]) * parlen
+                # One float32 block holds loc | vel back to back; the contiguous
+                # views are filled in place by foreach_get. Sizes get their own
+                # array (initiate only; per-frame exports never read them) since
+                # they outlive this call in the size cache, and a view would keep
+                # the whole block alive with them.
+                if initiate:
+                    par_buf = np.empty(parlen * 6, dtype=np.float32)
+                    par_alive = np.empty(parlen, dtype=np.int16)
+                    par_size = np.empty(parlen, dtype=np.float32)
+                else:
+                    par_buf, par_alive = _frame_buffers((ob.name, i), parlen)
+                    par_size = None
+                par_loc = par_buf[:parlen * 3]
+                par_vel = par_buf[parlen * 3:]
 
                 parnum += parlen
 
@@ -351,322 +998,117 @@ def pack_data(context, initiate):
                 # This stores RAW multipliers; final size = particle_size * scale_multiplier
                 par_scale = None
                 if initiate:
-                    par_scale = array.array("f", [1.0]) * parlen
+                    par_scale = np.ones(parlen, dtype=np.float32)
 
                 # Initialize field IDs array (3 components for angular_velocity: field_id, 0, 0)
                 par_field = None
                 if initiate:
-                    par_field = array.array("f", [0, 0, 0]) * parlen
+                    par_field = np.zeros(parlen * 3, dtype=np.float32)
 
                 # CSV override for initial positions, sizes, and field IDs (from particle settings)
-                if initiate:
-                    csv_path = psys_settings.mol_initial_csv
-                    if csv_path:
-                        import os
-                        import csv as csv_module
-                        csv_path_abs = bpy.path.abspath(csv_path)
-                        if os.path.exists(csv_path_abs):
-                            csv_rows = 0
-                            has_scale = False
-                            has_field = False
-                            is_2d = False
-                            with open(csv_path_abs) as f:
-                                reader = csv_module.DictReader(f)
-                                # Detect column names from first row
-                                fieldnames = reader.fieldnames
-                                # Support both generic (x,y,z) and tsne (tsne_x, tsne_y, tsne_z) column names
-                                if 'x' in fieldnames:
-                                    x_col, y_col = 'x', 'y'
-                                    z_col = 'z' if 'z' in fieldnames else None
-                                elif 'tsne_x' in fieldnames:
-                                    x_col, y_col = 'tsne_x', 'tsne_y'
-                                    z_col = 'tsne_z' if 'tsne_z' in fieldnames else None
-                                else:
-                                    print(f"  CSV Warning: No recognized position columns (x,y,z or tsne_x,tsne_y,tsne_z)")
-                                    x_col, y_col, z_col = None, None, None
-
-                                # Detect scale column (generic or citation-based)
-                                scale_col = None
-                                if 'scale' in fieldnames:
-                                    scale_col = 'scale'
-                                elif 'cited_by_count' in fieldnames:
-                                    scale_col = 'cited_by_count'
-                                elif 'total_citation_count' in fieldnames:
-                                    scale_col = 'total_citation_count'
-                                elif 'citation_count' in fieldnames:
-                                    scale_col = 'citation_count'
-                                elif 'citations' in fieldnames:
-                                    scale_col = 'citations'
-
-                                # Detect field/category column for coloring
-                                # Use user-selected field level if available
-                                field_col = None
-                                if 'field_id' in fieldnames:
-                                    field_col = 'field_id'
-                                else:
-                                    # Check for field_level_X based on user selection
-                                    selected_level = psys_settings.mol_csv_field_level
-                                    level_col = f'field_level_{selected_level}'
-                                    if level_col in fieldnames:
-                                        field_col = level_col
-                                    # Fallback to any available field_level
-                                    elif 'field_level_0' in fieldnames:
-                                        field_col = 'field_level_0'
-                                    elif 'field_level_1' in fieldnames:
-                                        field_col = 'field_level_1'
-                                    elif 'field_level_2' in fieldnames:
-                                        field_col = 'field_level_2'
-                                    elif 'mid_level' in fieldnames:
-                                        field_col = 'mid_level'
-                                    elif 'field' in fieldnames:
-                                        field_col = 'field'
-                                    elif 'category' in fieldnames:
-                                        field_col = 'category'
-                                    elif 'cluster' in fieldnames:
-                                        field_col = 'cluster'
-
-                                # Build field name to ID mapping (for string fields like "Medicine")
-                                field_to_id = {}
-                                next_field_id = 0
-
-                                if x_col and y_col:
-                                    is_2d = (z_col is None)
-                                    for idx, row in enumerate(reader):
-                                        csv_rows += 1
-                                        if idx >= parlen:
-                                            continue  # Count all rows but only use up to parlen
-                                        par_loc[idx*3] = float(row[x_col])
-                                        par_loc[idx*3+1] = float(row[y_col])
-                                        par_loc[idx*3+2] = float(row[z_col]) if z_col else 0.0
-                                        # Calculate particle size from CSV scale
-                                        # Pipeline: raw_csv -> max(min_scale) -> volume_mode -> global_multiplier -> particle_size
-                                        raw_scale = 0.0
-                                        if scale_col:
-                                            try:
-                                                val = row.get(scale_col, '')
-                                                if val and val.strip():
-                                                    raw_scale = float(val)
-                                                    has_scale = True
-                                            except (ValueError, TypeError):
-                                                pass
-
-                                        # Apply minimum scale (prevents zero-size)
-                                        min_scale = psys_settings.mol_csv_min_scale
-                                        clamped_scale = max(min_scale, raw_scale)
-
-                                        # Apply volume mode (cube root) if selected
-                                        if psys_settings.mol_csv_scale_mode == 'VOLUME':
-                                            effective_scale = clamped_scale ** (1.0 / 3.0)
-                                        else:
-                                            effective_scale = clamped_scale
-
-                                        # Apply global multiplier
-                                        global_mult = psys_settings.mol_csv_scale_multiplier
-                                        final_scale = effective_scale * global_mult
-
-                                        # Store and calculate final size
-                                        par_scale[idx] = final_scale
-                                        par_size[idx] = psys_settings.particle_size * final_scale
-                                        # Store field ID in angular_velocity (X component)
-                                        # Convert string field names to numeric IDs
-                                        if field_col and row.get(field_col):
-                                            field_val = row[field_col]
-                                            try:
-                                                # Try numeric first
-                                                field_id = float(field_val)
-                                            except (ValueError, TypeError):
-                                                # String field name - convert to ID
-                                                # Use grouped mapping for field_level_1 to cluster related fields
-                                                if field_col == 'field_level_1' and field_val in GROUPED_FIELD_L1_IDS:
-                                                    field_id = float(GROUPED_FIELD_L1_IDS[field_val])
-                                                    if field_val not in field_to_id:
-                                                        field_to_id[field_val] = GROUPED_FIELD_L1_IDS[field_val]
-                                                else:
-                                                    # Fallback to first-seen order for other columns or unknown fields
-                                                    if field_val not in field_to_id:
-                                                        field_to_id[field_val] = next_field_id
-                                                        next_field_id += 1
-                                                    field_id = float(field_to_id[field_val])
-                                            par_field[idx*3] = field_id
-                                            par_field[idx*3+1] = 0.0  # Y unused
-                                            par_field[idx*3+2] = 0.0  # Z unused
-                                            has_field = True
-                            loaded = min(csv_rows, parlen)
-                            dim_msg = "2D" if is_2d else "3D"
-                            size_msg = ", with scales" if has_scale else ""
-                            field_msg = f", with {len(field_to_id)} fields" if has_field and field_to_id else (", with field IDs" if has_field else "")
-                            print(f"  CSV: Loaded {loaded} {dim_msg} positions{size_msg}{field_msg} from {csv_path_abs}")
-                            # Print field name to ID mapping if string fields were converted
-                            if field_to_id:
-                                print(f"  Field mapping ({field_col}):")
-                                for name, fid in sorted(field_to_id.items(), key=lambda x: x[1]):
-                                    print(f"    {fid}: {name}")
-                            if csv_rows != parlen:
-                                print(f"  Warning: CSV has {csv_rows} rows, particle system has {parlen} particles")
+                if initiate and (ob.name, i) in csv_prefetch:
+                    csv_path_abs, csv_data = csv_prefetch[(ob.name, i)]
+                    csv_rows = csv_data['csv_rows']
+                    field_col = csv_data['field_col']
+                    field_to_id = csv_data['field_to_id']
+
+                    if csv_data['positions'] is not None:
+                        # Read settings once: RNA property access is slow
+                        min_scale = psys_settings.mol_csv_min_scale
+                        volume_mode = psys_settings.mol_csv_scale_mode == 'VOLUME'
+                        global_mult = psys_settings.mol_csv_scale_multiplier
+                        pbase = psys_settings.particle_size
+
+                        # Store field ID in angular_velocity (X component)
+                        if field_col:
+                            ids = csv_data['field_ids']
+                            # Pre-zeroed buffer: plain strided store into X, Y/Z untouched
+                            par_field.reshape(-1, 3)[:len(ids), 0] = ids
+
+                        positions = csv_data['positions']
+                        n = len(positions)
+                        par_loc.reshape(-1, 3)[:n] = positions
+
+                        # Calculate particle size from CSV scale
+                        # Pipeline: raw_csv -> max(min_scale) -> volume_mode -> global_multiplier -> particle_size
+                        raw_scale = csv_data['raw_scale']
+                        if raw_scale is None:
+                            raw_scale = np.zeros(n, dtype=np.float64)
+
+                        # Multipliers land directly in par_scale, then
+                        # size = particle_size * multiplier (no temporaries)
+                        _apply_scale_pipeline(raw_scale, min_scale, volume_mode, global_mult, out=par_scale[:n])
+                        np.multiply(par_scale[:n], pbase, out=par_size[:n])
+                    loaded = min(csv_rows, parlen)
+                    dim_msg = "2D" if csv_data['is_2d'] else "3D"
+                    size_msg = ", with scales" if csv_data['has_scale'] else ""
+                    has_field = csv_data['has_field']
+                    field_msg = f", with {len(field_to_id)} fields" if has_field and field_to_id else (", with field IDs" if has_field else "")
+                    print(f"  CSV: Loaded {loaded} {dim_msg} positions{size_msg}{field_msg} from {csv_path_abs}")
+                    # Print field name to ID mapping if string fields were converted
+                    if field_to_id:
+                        print(f"  Field mapping ({field_col}):")
+                        for name, fid in sorted(field_to_id.items(), key=lambda x: x[1]):
+                            print(f"    {fid}: {name}")
+                    if csv_rows != parlen:
+                        print(f"  Warning: CSV has {csv_rows} rows, particle system has {parlen} particles")
 
                 if initiate:
-                    par_mass = array.array("f", [0]) * parlen
-
                     # Note: par_size already fetched earlier (before CSV override)
 
                     # use texture in slot 0 for particle weak
-                    par_weak = array.array("f", [1.0]) * parlen
-
-                    if psys_settings.mol_bake_weak_map_geo:
-                        get_gn_float_attr(ob, "M+ weak map", "weak_map", par_weak)
-                        # Force depsgraph to re-evaluate with modifiers reenabled
-                        ob.update_tag()  # ← Critical!
-                        bpy.context.view_layer.update()
-                        obj = get_object(context, ob)
-                        psys = obj.particle_systems[i]
-
                     if psys_settings.mol_bake_weak_map:
+                        # Every element is written by get_weak_map
+                        par_weak = np.empty(parlen, dtype=np.float32)
                         get_weak_map(obj, psys, par_weak)
-
-                    if psys_settings.mol_density_active:
-                        par_mass_np = np.asarray(par_mass)
-                        par_size_np = np.asarray(par_size)
-                        par_mass_np[:] = psys_settings.mol_density * (
-                            4 / 3 * 3.141592653589793 * ((par_size_np / 2) ** 3)
-                        )
-                        par_mass = par_mass_np
-
+                    elif psys_settings.mol_bake_weak_map_geo:
+                        # Baked once per object above
+                        if len(geo_weak_map) != parlen:
+                            raise ValueError("Attribute and weak_map lengths do not match !")
+                        par_weak = geo_weak_map.copy()
                     else:
-                        par_mass = array.array("f", [psys_settings.mass]) * parlen
+                        par_weak = _ones_view(parlen)
 
-                    if scene.timescale != 1.0:
-                        psys_settings.timestep = 1 / (
-                            scene.render.fps / scene.timescale
-                        )
-                    else:
-                        psys_settings.timestep = 1 / scene.render.fps
+                    par_mass = get_particle_masses((ob.name, i), psys_settings, par_size)
+
+                    psys_settings.timestep = timestep
 
                     psyslen += 1
 
-                    if bpy.context.scene.mol_minsize > min(par_size):
-                        bpy.context.scene.mol_minsize = min(par_size)
+                    min_size = float(par_size.min())
+                    if scene.mol_minsize > min_size:
+                        scene.mol_minsize = min_size
 
+                    # "Same value" toggles mirror the link settings onto their
+                    # broken-link ("e") counterparts
                     if psys_settings.mol_link_samevalue:
-                        psys_settings.mol_link_estiff = psys_settings.mol_link_stiff
-                        psys_settings.mol_link_estiffrand = (
-                            psys_settings.mol_link_stiffrand
-                        )
-                        psys_settings.mol_link_estiffexp = (
-                            psys_settings.mol_link_stiffexp
-                        )
-                        psys_settings.mol_link_edamp = psys_settings.mol_link_damp
-                        psys_settings.mol_link_edamprand = (
-                            psys_settings.mol_link_damprand
-                        )
-                        psys_settings.mol_link_ebroken = psys_settings.mol_link_broken
-                        psys_settings.mol_link_ebrokenrand = (
-                            psys_settings.mol_link_brokenrand
-                        )
+                        for dst, src in LINK_SAMEVALUE_PAIRS:
+                            setattr(psys_settings, "mol_link_" + dst, getattr(psys_settings, "mol_link_" + src))
 
                     if psys_settings.mol_relink_samevalue:
-                        psys_settings.mol_relink_estiff = psys_settings.mol_relink_stiff
-                        psys_settings.mol_relink_estiffrand = (
-                            psys_settings.mol_relink_stiffrand
-                        )
-                        psys_settings.mol_relink_estiffexp = (
-                            psys_settings.mol_relink_stiffexp
-                        )
-                        psys_settings.mol_relink_edamp = psys_settings.mol_relink_damp
-                        psys_settings.mol_relink_edamprand = (
-                            psys_settings.mol_relink_damprand
-                        )
-                        psys_settings.mol_relink_ebroken = (
-                            psys_settings.mol_relink_broken
-                        )
-                        psys_settings.mol_relink_ebrokenrand = (
-                            psys_settings.mol_relink_brokenrand
-                        )
+                        for dst, src in LINK_SAMEVALUE_PAIRS:
+                            setattr(psys_settings, "mol_relink_" + dst, getattr(psys_settings, "mol_relink_" + src))
 
-                    # Pre-simulation overlap relaxation
+                    # Pre-simulation overlap relaxation, run once every system is packed
                     if psys_settings.mol_relax_overlaps:
-                        iters, initial, final = relax_particle_overlaps(
+                        relax_jobs.append((
+                            psys_settings.name,
                             par_loc,
                             par_size,
-                            max_iterations=psys_settings.mol_relax_iterations,
-                            min_separation=psys_settings.mol_relax_separation,
-                            strength=psys_settings.mol_relax_strength,
-                            num_threads=scene.mol_cpu
-                        )
-                        if initial > 0:
-                            if final == 0:
-                                print(f"  Relaxation: {initial} overlaps resolved in {iters} iterations")
-                            else:
-                                print(f"  Relaxation: {initial} initial overlaps, {final} remaining after {iters} iterations (increase iterations)")
-                        else:
-                            print(f"  Relaxation: no overlaps detected")
-
-                    params = [0] * 56
-
-                    params[0] = psys_settings.mol_selfcollision_active
-                    params[1] = psys_settings.mol_othercollision_active
-                    params[2] = psys_settings.mol_collision_group
-                    params[3] = psys_settings.mol_friction
-                    params[4] = psys_settings.mol_collision_damp
-                    params[5] = psys_settings.mol_links_active
-                    params[6] = psys_settings.mol_link_length
-                    params[7] = psys_settings.mol_link_max
-                    params[8] = psys_settings.mol_link_tension
-                    params[9] = psys_settings.mol_link_tensionrand
-                    params[10] = psys_settings.mol_link_stiff
-                    params[11] = psys_settings.mol_link_stiffrand
-                    params[12] = psys_settings.mol_link_stiffexp
-                    params[13] = psys_settings.mol_link_damp
-                    params[14] = psys_settings.mol_link_damprand
-                    params[15] = psys_settings.mol_link_broken
-                    params[16] = psys_settings.mol_link_brokenrand
-                    params[17] = psys_settings.mol_link_estiff
-                    params[18] = psys_settings.mol_link_estiffrand
-                    params[19] = psys_settings.mol_link_estiffexp
-                    params[20] = psys_settings.mol_link_edamp
-                    params[21] = psys_settings.mol_link_edamprand
-                    params[22] = psys_settings.mol_link_ebroken
-                    params[23] = psys_settings.mol_link_ebrokenrand
-                    params[24] = psys_settings.mol_relink_group
-                    params[25] = psys_settings.mol_relink_chance
-                    params[26] = psys_settings.mol_relink_chancerand
-                    params[27] = psys_settings.mol_relink_max
-                    params[28] = psys_settings.mol_relink_tension
-                    params[29] = psys_settings.mol_relink_tensionrand
-                    params[30] = psys_settings.mol_relink_stiff
-                    params[31] = psys_settings.mol_relink_stiffexp
-                    params[32] = psys_settings.mol_relink_stiffrand
-                    params[33] = psys_settings.mol_relink_damp
-                    params[34] = psys_settings.mol_relink_damprand
-                    params[35] = psys_settings.mol_relink_broken
-                    params[36] = psys_settings.mol_relink_brokenrand
-                    params[37] = psys_settings.mol_relink_estiff
-                    params[38] = psys_settings.mol_relink_estiffexp
-                    params[39] = psys_settings.mol_relink_estiffrand
-                    params[40] = psys_settings.mol_relink_edamp
-                    params[41] = psys_settings.mol_relink_edamprand
-                    params[42] = psys_settings.mol_relink_ebroken
-                    params[43] = psys_settings.mol_relink_ebrokenrand
-                    params[44] = psys_settings.mol_link_friction
-                    params[45] = psys_settings.mol_link_group
-                    params[46] = psys_settings.mol_other_link_active
-                    params[47] = int(psys_settings.mol_link_rellength)
-                    params[48] = psys_settings.mol_collision_adhesion_search_distance
-                    params[49] = psys_settings.mol_collision_adhesion_factor
-                    # Gravity (Barnes-Hut)
-                    params[50] = psys_settings.mol_gravity_active
-                    params[51] = psys_settings.mol_gravity_strength
-                    params[52] = psys_settings.mol_gravity_theta
-                    params[53] = psys_settings.mol_gravity_softening
-                    params[54] = psys_settings.mol_gravity_initial_rotation
-                    params[55] = psys_settings.mol_gravity_rotation_falloff
-
-                mol_exportdata = bpy.context.scene.mol_exportdata
+                            psys_settings.mol_relax_iterations,
+                            psys_settings.mol_relax_separation,
+                            psys_settings.mol_relax_strength,
+                        ))
+
+                    # Plain Python numbers: the core assigns several of these to C ints
+                    params = list(_get_mol_params(psys_settings))
+                    params[47] = int(params[47])  # mol_link_rellength (bool)
 
                 if initiate:
                     mol_exportdata[0][2] = psyslen
                     mol_exportdata[0][3] = parnum
                     mol_exportdata.append(
-                        (
+                        MolExportSystem(
                             parlen,
                             par_loc,
                             par_vel,
@@ -681,4 +1123,8 @@ def pack_data(context, initiate):
                     )
                 else:
                     self_coll = psys_settings.mol_selfcollision_active
-                    mol_exportdata.append((par_loc, par_vel, par_alive, self_coll))
+                    mol_exportdata.append(MolExportFrame(par_loc, par_vel, par_alive, self_coll))
+
+    # Relaxation edits par_loc in place, which the exported tuples already reference
+    if relax_jobs:
+        _run_relaxations(relax_jobs, scene.mol_cpu)
@@ -25,9 +25,11 @@ def get_csv_row_count(csv_path):
 
         # File changed or not cached - count rows
         import csv
-        with open(abs_path) as f:
-            reader = csv.DictReader(f)
-            count = sum(1 for _ in reader)
+        with open(abs_path, newline='', buffering=1 << 20) as f:
+            # Positional rows: no per-row dict; blank rows skipped as DictReader did
+            reader = csv.reader(f)
+            next(reader, None)  # header
+            count = sum(1 for row in reader if row)
 
         _csv_count_cache[abs_path] = (mtime, count)
         return count
@@ -24,20 +24,120 @@ Meeting frames: {4, 32772, 65540}
 """
 
 import os
+import time
+import shutil
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def find_frame(frame_num: int, directories: list[Path], extension: str) -> Path | None:
-    """Find a frame file across multiple source directories."""
-    name = f"{frame_num:04d}{extension}"
-    for d in directories:
-        path = d / name
-        if path.exists() and path.stat().st_size > 0:
-            return path
+# Directory existence probes, cached for the run: {Path: bool}
+_DIR_EXISTS = {}
+
+
+def _existing_dirs(dirs: list[Path], timeout: float = 0.5) -> list[Path]:
+    """
+    Return the directories that exist, keeping their order.
+    Uncached paths are probed concurrently on daemon threads; a probe that has
+    not answered within timeout seconds (e.g. a sleeping or half-mounted
+    drive) counts as missing rather than stalling the run.
+    """
+    pending = [d for d in dict.fromkeys(dirs) if d not in _DIR_EXISTS]
+    results = {}
+
+    def probe(d):
+        results[d] = d.exists()
+
+    threads = [threading.Thread(target=probe, args=(d,), daemon=True) for d in pending]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for d, t in zip(pending, threads):
+        t.join(max(0.0, deadline - time.monotonic()))
+        if d not in results:
+            print(f"  Skipping {d}: no response within {timeout}s")
+        _DIR_EXISTS[d] = results.get(d, False)
+    return [d for d in dirs if _DIR_EXISTS[d]]
+
+
+def _index_dir(d: Path, extension: str) -> dict[int, os.DirEntry]:
+    """
+    Map frame number to directory entry for every "{####}{ext}" file in d.
+    The directory is resolved once up front, so entry paths are absolute and
+    usable as symlink targets as-is.
+    """
+    index = {}
+    try:
+        entries = os.scandir(os.path.realpath(d))
+    except FileNotFoundError:
+        return index
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(extension):
+                continue
+            stem = name[:len(name) - len(extension)]
+            if stem.isascii() and stem.isdigit():
+                frame_num = int(stem)
+                # Only the exact name find_frame would build (no "04.exr" aliases)
+                if stem == f"{frame_num:04d}":
+                    index[frame_num] = entry
+    return index
+
+
+def find_frame(frame_num: int, indexes: list[dict[int, os.DirEntry]]) -> Path | None:
+    """Find a non-empty frame file across the indexed source directories (searched in order)."""
+    for index in indexes:
+        entry = index.get(frame_num)
+        if entry is None:
+            continue
+        try:
+            # DirEntry caches the stat, so each file is stat'ed at most once
+            if entry.stat().st_size > 0:
+                return Path(entry.path)
+        except OSError:
+            pass  # Dangling symlink or file removed since the listing
     return None
 
 
+def _swap_into_place(build_dir: Path, output_dir: Path):
+    """
+    Replace output_dir with the freshly built build_dir.
+    The old directory is renamed aside first, so output_dir is only missing
+    for the instant between two renames. Its symlinks are dropped; any other
+    files in it (notes, grading projects) are carried over to the new one.
+    """
+    if not output_dir.exists():
+        os.rename(build_dir, output_dir)
+        return
+
+    # A leftover .old from an earlier run may still hold user files that
+    # clashed with link names, so pick a fresh name instead of clearing it
+    old_dir = output_dir.with_name(output_dir.name + '.old')
+    suffix = 1
+    while os.path.lexists(old_dir):
+        old_dir = output_dir.with_name(f"{output_dir.name}.old.{suffix}")
+        suffix += 1
+    os.rename(output_dir, old_dir)
+    os.rename(build_dir, output_dir)
+
+    kept = False
+    with os.scandir(old_dir) as entries:
+        for entry in entries:
+            if entry.is_symlink():
+                os.unlink(entry.path)
+            elif os.path.lexists(os.path.join(output_dir, entry.name)):
+                kept = True  # Would overwrite a new link; leave it where it is
+            else:
+                os.rename(entry.path, os.path.join(output_dir, entry.name))
+    if kept:
+        print(f"  Warning: files clashing with new link names left in {old_dir}")
+    else:
+        os.rmdir(old_dir)
+    print(f"  Replaced existing sequence in {output_dir}")
+
+
 def generate_sequence(
     fw_dirs: list[Path],
     bw_dirs: list[Path],
@@ -73,40 +173,43 @@ def generate_sequence(
     if remainder != 0:
         crossover = crossover - remainder
 
-    # Build forward sequence: frame_offset to crossover (inclusive)
-    fw_frames = list(range(frame_offset, crossover + 1, step))
-
-    # Build backward sequence (will be reversed):
-    # frame_offset to crossover - step (skip crossover to avoid duplicate)
-    bw_frames_ascending = list(range(frame_offset, crossover, step))
-    bw_frames_reversed = list(reversed(bw_frames_ascending))
+    # Build forward sequence: frame_offset to crossover (inclusive).
+    # Both passes stay lazy ranges; nothing is materialised per frame.
+    fw_frames = range(frame_offset, crossover + 1, step)
 
-    # For a perfect loop, also skip frame_offset at the end of backward
-    # (it would duplicate the first frame of forward when looping)
-    if bw_frames_reversed and bw_frames_reversed[-1] == frame_offset:
-        bw_frames_reversed = bw_frames_reversed[:-1]
+    # Build backward sequence, already reversed: crossover - step down to
+    # frame_offset + step. Skipping the crossover avoids a duplicate, and for a
+    # perfect loop frame_offset is skipped too (it would duplicate the first
+    # frame of forward when looping)
+    bw_frames_reversed = range(crossover - step, frame_offset, -step)
 
     # Full sequence: forward then backward reversed
-    sequence = [(f, 'fw') for f in fw_frames] + [(f, 'bw') for f in bw_frames_reversed]
+    sequence_len = len(fw_frames) + len(bw_frames_reversed)
+
+    # List each source directory once instead of probing every (frame, directory) pair.
+    # The directories sit on separate drives, so list them concurrently; map keeps search order.
+    all_dirs = list(fw_dirs) + list(bw_dirs)
+    with ThreadPoolExecutor(max_workers=max(1, len(all_dirs))) as pool:
+        indexes = list(pool.map(_index_dir, all_dirs, [extension] * len(all_dirs)))
+    fw_index = indexes[:len(fw_dirs)]
+    bw_index = indexes[len(fw_dirs):]
 
     # Check which frames exist
     missing_fw = []
     missing_bw = []
     found_sequence = []
 
-    for frame_num, source in sequence:
-        dirs = fw_dirs if source == 'fw' else bw_dirs
-        path = find_frame(frame_num, dirs, extension)
-        if path:
-            found_sequence.append((frame_num, source, path))
-        else:
-            if source == 'fw':
-                missing_fw.append(frame_num)
+    for source, frames, indexes, missing in (('fw', fw_frames, fw_index, missing_fw),
+                                             ('bw', bw_frames_reversed, bw_index, missing_bw)):
+        for frame_num in frames:
+            path = find_frame(frame_num, indexes)
+            if path:
+                found_sequence.append((frame_num, source, path))
             else:
-                missing_bw.append(frame_num)
+                missing.append(frame_num)
 
     stats = {
-        'total_sequence': len(sequence),
+        'total_sequence': sequence_len,
         'found': len(found_sequence),
         'missing_fw': len(missing_fw),
         'missing_bw': len(missing_bw),
@@ -119,8 +222,8 @@ def generate_sequence(
     print(f"Seamless loop sequence (step {step}, {crossover_pct}% crossover):")
     print(f"  Forward:  {len(fw_frames)} frames ({frame_offset} → {crossover})")
     print(f"  Backward: {len(bw_frames_reversed)} frames ({crossover - step} → {frame_offset + step}, reversed)")
-    print(f"  Total:    {len(sequence)} frames")
-    print(f"  Found:    {len(found_sequence)} / {len(sequence)}")
+    print(f"  Total:    {sequence_len} frames")
+    print(f"  Found:    {len(found_sequence)} / {sequence_len}")
     if missing_fw:
         print(f"  Missing forward:  {len(missing_fw)} (first: {missing_fw[0]}, last: {missing_fw[-1]})")
     if missing_bw:
@@ -132,21 +235,41 @@ def generate_sequence(
         print("DRY RUN — no symlinks created")
         return stats
 
-    # Create output directory (clean it first if it exists)
-    if output_dir.exists():
-        # Remove old symlinks only
-        for f in output_dir.iterdir():
-            if f.is_symlink():
-                f.unlink()
-        print(f"  Cleaned existing symlinks in {output_dir}")
-    else:
-        output_dir.mkdir(parents=True)
+    # Build into a sibling directory and swap it in at the end, so an aborted
+    # run never leaves a half-emptied output directory behind
+    build_dir = output_dir.with_name(output_dir.name + '.building')
+    if build_dir.exists():
+        shutil.rmtree(build_dir)  # Leftover from an aborted run
+    build_dir.mkdir(parents=True)
+
+    # Create sequentially-numbered symlinks (0-indexed for DaVinci compatibility).
+    # Each link is one independent syscall, so spread them over a few threads.
+    # Links are made relative to an open handle on the output directory, so
+    # its path is looked up once rather than per link; one fsync at the end
+    # then makes the whole batch durable.
+    dir_fd = os.open(build_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        if os.symlink in os.supports_dir_fd:
+            def make_link(item):
+                out_idx, (frame_num, source, src_path) = item
+                os.symlink(os.fspath(src_path), f"{out_idx:06d}{extension}", dir_fd=dir_fd)
+        else:
+            out_prefix = os.path.join(build_dir, '')
+
+            def make_link(item):
+                out_idx, (frame_num, source, src_path) = item
+                os.symlink(os.fspath(src_path), f"{out_prefix}{out_idx:06d}{extension}")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(make_link, enumerate(found_sequence)))  # list() re-raises any failure
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass  # Some filesystems refuse fsync on a directory; the links are still made
+    finally:
+        os.close(dir_fd)
 
-    # Create sequentially-numbered symlinks (0-indexed for DaVinci compatibility)
-    for out_idx, (frame_num, source, src_path) in enumerate(found_sequence, start=0):
-        link_name = f"{out_idx:06d}{extension}"
-        link_path = output_dir / link_name
-        link_path.symlink_to(src_path.resolve())
+    _swap_into_place(build_dir, output_dir)
 
     print(f"Created {len(found_sequence)} symlinks in {output_dir}")
     print(f"  First: 000000{extension} → frame {found_sequence[0][0]} ({found_sequence[0][1]})")
@@ -229,8 +352,8 @@ Examples:
             ]
 
     # Filter to directories that actually exist
-    fw_dirs = [d for d in fw_dirs if d.exists()]
-    bw_dirs = [d for d in bw_dirs if d.exists()]
+    fw_dirs = _existing_dirs(fw_dirs)
+    bw_dirs = _existing_dirs(bw_dirs)
 
     print(f"Forward dirs:  {[str(d) for d in fw_dirs]}")
     print(f"Backward dirs: {[str(d) for d in bw_dirs]}")
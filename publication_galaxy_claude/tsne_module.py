@@ -11,14 +11,40 @@ Usage:
 """
 
 import os
+import ast
 import csv
+import hashlib
 import pickle
+import tempfile
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
 from sklearn.manifold import TSNE
 from sklearn.decomposition import PCA
 
+# Optional: openTSNE is multi-threaded and has an FFT-accelerated gradient,
+# far faster than sklearn on the full corpus. Falls back to sklearn if absent.
+try:
+    from openTSNE import TSNE as OpenTSNE
+except ImportError:
+    OpenTSNE = None
+
+# Optional: datashader rasterizes large point clouds into one image instead of
+# drawing every marker. Falls back to matplotlib scatter if absent.
+try:
+    import datashader as ds
+except ImportError:
+    ds = None
+
+# Optional: pyarrow's multi-threaded C++ CSV writer for the large mapping CSVs.
+# Falls back to pandas to_csv if absent.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pacsv = None
+
 
 # =============================================================================
 # Configuration
@@ -28,12 +54,15 @@ DEFAULT_OUTPUT_DIR = "/mnt/wwn-0x5000c500d577b928/mo_data/models_etc/tsne"
 DEFAULT_EMBEDDINGS_FILE = "/mnt/wwn-0x5000c500d577b928/mo_data/datasets/418.9k_UCL_title_abstracts_whole_abstract_max_sentences_BAAI-bge-large-en_embeddings"
 DEFAULT_OPENALEX_FILE = "/home/mo/github/datasets/419K_decoded_abstracts_w_all_openalex_cols.pkl"
 
+# visualize_tsne rasterizes (when datashader is installed) from this many points up
+RASTERIZE_MIN_POINTS = 100_000
+
 
 # =============================================================================
 # Data Loading Functions
 # =============================================================================
 
-def load_tsne_data(csv_path=None, n_samples=None):
+def load_tsne_data(csv_path=None, n_samples=None, usecols=None, dtype=None, engine=None):
     """
     Load TSNE data from a pre-computed CSV file.
 
@@ -41,6 +70,12 @@ def load_tsne_data(csv_path=None, n_samples=None):
         csv_path: Path to CSV file. If None, uses default based on n_samples.
         n_samples: If csv_path is None, load the file for this sample count.
                    Options: None (full ~370K), 64000, 8000
+        usecols: Only load these columns (e.g. ['tsne_x', 'tsne_y', 'cited_by_count']
+                 for plotting, skipping the large abstract text). None loads all.
+        dtype: Optional column dtypes, passed to pandas.read_csv
+        engine: pandas.read_csv parser. None uses the default C parser;
+                'pyarrow' is multi-threaded but cannot read quoted
+                multi-line titles/abstracts and infers dtypes differently
 
     Returns:
         pandas DataFrame with columns: cleaned_title, decoded_abstract,
@@ -55,7 +90,7 @@ def load_tsne_data(csv_path=None, n_samples=None):
             csv_path = os.path.join(DEFAULT_OUTPUT_DIR, f"ucl_papers_tsne_mapping_{sample_str}.csv")
 
     print(f"Loading TSNE data from: {csv_path}")
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, usecols=usecols, dtype=dtype, engine=engine)
     print(f"Loaded {len(df):,} papers with TSNE coordinates")
     return df
 
@@ -84,10 +119,32 @@ def load_tsne_coordinates(pickle_path=None, n_samples=None):
 # Visualization Functions
 # =============================================================================
 
+def _rasterize_points(ax, x, y, values, figsize, cmap, alpha):
+    """
+    Aggregate points onto a figure-sized pixel grid with datashader and draw
+    it as a single image: mean of values per pixel, or plain coverage if
+    values is None. Returns the AxesImage (for a colorbar).
+    """
+    x_range = (float(np.nanmin(x)), float(np.nanmax(x)))
+    y_range = (float(np.nanmin(y)), float(np.nanmax(y)))
+    canvas = ds.Canvas(plot_width=int(figsize[0] * 100), plot_height=int(figsize[1] * 100),
+                       x_range=x_range, y_range=y_range)
+    points = pd.DataFrame({'x': x, 'y': y})
+    if values is not None:
+        points['c'] = values
+        grid = canvas.points(points, 'x', 'y', ds.mean('c')).values
+    else:
+        # Single colour wherever any point lands, transparent elsewhere
+        grid = np.where(canvas.points(points, 'x', 'y', ds.count()).values > 0, 1.0, np.nan)
+        cmap = ListedColormap(['C0'])
+    return ax.imshow(grid, origin='lower', extent=[*x_range, *y_range],
+                     cmap=cmap, alpha=alpha, interpolation='nearest')
+
+
 def visualize_tsne(df, color_by=None, cmap='viridis', figsize=(12, 10),
                    point_size=1, alpha=0.5, title=None,
                    log_color=False, colorbar_label=None,
-                   save_path=None, show=True):
+                   save_path=None, show=True, rasterize=None):
     """
     Visualize TSNE embedding space.
 
@@ -104,29 +161,46 @@ def visualize_tsne(df, color_by=None, cmap='viridis', figsize=(12, 10),
         colorbar_label: Label for colorbar (auto-generated if None)
         save_path: If provided, save figure to this path
         show: If True, display the figure
+        rasterize: If True, draw one datashader image instead of per-point
+                   markers (point_size is then ignored). If None, rasterize
+                   from RASTERIZE_MIN_POINTS points when datashader is installed.
 
     Returns:
         matplotlib Figure object
     """
     fig, ax = plt.subplots(figsize=figsize)
 
+    if rasterize is None:
+        rasterize = len(df) >= RASTERIZE_MIN_POINTS
+    rasterize = rasterize and ds is not None
+
     # Prepare color values
     if color_by is not None and color_by in df.columns:
-        colors = df[color_by].copy()
+        colors = df[color_by]
         if log_color:
-            # Handle zeros/negatives for log transform
-            colors = colors.apply(lambda x: np.log(x) if x > 0 else np.nan)
+            # Handle zeros/negatives for log transform: one vectorised pass,
+            # NaN wherever the value is not positive
+            values = colors.to_numpy(dtype=float)
+            colors = np.full_like(values, np.nan)
+            np.log(values, out=colors, where=values > 0)
             if colorbar_label is None:
                 colorbar_label = f'Log({color_by})'
         else:
             if colorbar_label is None:
                 colorbar_label = color_by
 
-        scatter = ax.scatter(
-            df['tsne_x'], df['tsne_y'],
-            c=colors, cmap=cmap, s=point_size, alpha=alpha
-        )
+        if rasterize:
+            scatter = _rasterize_points(ax, df['tsne_x'].to_numpy(), df['tsne_y'].to_numpy(),
+                                        np.asarray(colors, dtype=float), figsize, cmap, alpha)
+        else:
+            scatter = ax.scatter(
+                df['tsne_x'], df['tsne_y'],
+                c=colors, cmap=cmap, s=point_size, alpha=alpha
+            )
         plt.colorbar(scatter, ax=ax, label=colorbar_label)
+    elif rasterize:
+        _rasterize_points(ax, df['tsne_x'].to_numpy(), df['tsne_y'].to_numpy(),
+                          None, figsize, cmap, alpha)
     else:
         ax.scatter(df['tsne_x'], df['tsne_y'], s=point_size, alpha=alpha)
 
@@ -175,8 +249,13 @@ def visualize_tsne_heatmap(df, figsize=(12, 10), bins=200, cmap='hot',
     """
     fig, ax = plt.subplots(figsize=figsize)
 
-    h = ax.hist2d(df['tsne_x'], df['tsne_y'], bins=bins, cmap=cmap, cmin=1)
-    plt.colorbar(h[3], ax=ax, label='Number of papers')
+    # Bin with NumPy and draw one image rather than a per-bin mesh;
+    # empty bins are masked (as cmin=1 did) so they stay transparent
+    counts, x_edges, y_edges = np.histogram2d(df['tsne_x'].to_numpy(), df['tsne_y'].to_numpy(), bins=bins)
+    counts = np.ma.masked_less(counts, 1)
+    image = ax.imshow(counts.T, origin='lower', extent=[x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]],
+                      cmap=cmap, interpolation='nearest')
+    plt.colorbar(image, ax=ax, label='Number of papers')
 
     if title is None:
         title = f'TSNE Density Heatmap ({len(df):,} papers)'
@@ -201,9 +280,17 @@ def visualize_tsne_heatmap(df, figsize=(12, 10), bins=200, cmap='hot',
 # TSNE Computation Functions (for generating new embeddings)
 # =============================================================================
 
+def _array_digest(array):
+    """Content hash of an array (values, shape and dtype) for cache file names."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.shape}{array.dtype.str}".encode())
+    digest.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+    return digest.hexdigest()
+
+
 def compute_tsne_from_embeddings(embeddings_array, n_components=2, perplexity=40,
                                   n_iter=1000, use_pca=True, pca_components=50,
-                                  random_state=42, verbose=2):
+                                  random_state=42, verbose=2, pca_cache_dir=None):
     """
     Compute TSNE from embedding vectors.
 
@@ -216,27 +303,67 @@ def compute_tsne_from_embeddings(embeddings_array, n_components=2, perplexity=40
         pca_components: Number of PCA components
         random_state: Random seed for reproducibility
         verbose: Verbosity level
+        pca_cache_dir: Directory where PCA outputs are cached, keyed by a hash of
+                       the embeddings and pca_components. None (default) disables
+                       the cache. Writing it is best-effort: failures only warn.
 
     Returns:
         numpy array of shape (n_samples, n_components)
     """
     if use_pca and embeddings_array.shape[1] > pca_components:
-        print(f"Applying PCA: {embeddings_array.shape[1]} -> {pca_components} dimensions")
-        pca = PCA(n_components=pca_components)
-        embeddings_for_tsne = pca.fit_transform(embeddings_array)
-        print(f"PCA explained variance: {sum(pca.explained_variance_ratio_):.3f}")
+        cache_path = None
+        if pca_cache_dir is not None:
+            cache_path = os.path.join(pca_cache_dir, f"pca_{_array_digest(embeddings_array)}_{pca_components}.npy")
+        if cache_path is not None and os.path.exists(cache_path):
+            print(f"Loading cached PCA ({pca_components} dimensions): {cache_path}")
+            embeddings_for_tsne = np.load(cache_path)
+        else:
+            print(f"Applying PCA: {embeddings_array.shape[1]} -> {pca_components} dimensions")
+            pca = PCA(n_components=pca_components)
+            embeddings_for_tsne = pca.fit_transform(embeddings_array)
+            print(f"PCA explained variance: {sum(pca.explained_variance_ratio_):.3f}")
+            if cache_path is not None:
+                # Write a uniquely named temp file then rename, so an interrupted or
+                # concurrent save never leaves a truncated cache
+                tmp_path = None
+                try:
+                    os.makedirs(pca_cache_dir, exist_ok=True)
+                    with tempfile.NamedTemporaryFile(dir=pca_cache_dir, suffix='.tmp', delete=False) as f:
+                        tmp_path = f.name
+                        np.save(f, embeddings_for_tsne)
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    print(f"Warning: could not cache PCA to {cache_path}: {e}")
+                    if tmp_path is not None and os.path.exists(tmp_path):
+                        os.remove(tmp_path)
     else:
         embeddings_for_tsne = embeddings_array
 
     print(f"Computing {n_components}D TSNE (perplexity={perplexity}, iterations={n_iter})...")
-    tsne = TSNE(
-        n_components=n_components,
-        perplexity=perplexity,
-        n_iter=n_iter,
-        verbose=verbose,
-        random_state=random_state
-    )
-    tsne_results = tsne.fit_transform(embeddings_for_tsne)
+    if OpenTSNE is not None:
+        # openTSNE counts the 250 early-exaggeration iterations separately,
+        # sklearn includes them in n_iter. FFT interpolation only pays off in
+        # 2D; Barnes-Hut is the faster choice for 3D.
+        tsne = OpenTSNE(
+            n_components=n_components,
+            perplexity=perplexity,
+            early_exaggeration_iter=250,
+            n_iter=max(n_iter - 250, 0),
+            negative_gradient_method='fft' if n_components <= 2 else 'bh',
+            n_jobs=-1,
+            verbose=bool(verbose),
+            random_state=random_state
+        )
+        tsne_results = np.asarray(tsne.fit(embeddings_for_tsne))
+    else:
+        tsne = TSNE(
+            n_components=n_components,
+            perplexity=perplexity,
+            n_iter=n_iter,
+            verbose=verbose,
+            random_state=random_state
+        )
+        tsne_results = tsne.fit_transform(embeddings_for_tsne)
     print(f"TSNE complete. Shape: {tsne_results.shape}")
 
     return tsne_results
@@ -273,7 +400,7 @@ def load_embeddings_and_metadata(embeddings_file=None, openalex_file=None,
     n_duplicates = embeddings_df.duplicated(subset='decoded_abstract', keep='first').sum()
     print(f"Found {n_duplicates:,} duplicate abstracts")
 
-    embeddings_df = embeddings_df.drop_duplicates(subset='decoded_abstract', keep='first').copy()
+    embeddings_df = embeddings_df.drop_duplicates(subset='decoded_abstract', keep='first')
     embeddings_df = embeddings_df.reset_index(drop=True)
     print(f"After deduplication: {len(embeddings_df):,} unique papers")
 
@@ -283,16 +410,60 @@ def load_embeddings_and_metadata(embeddings_file=None, openalex_file=None,
         embeddings_df = embeddings_df.sample(n=max_samples, random_state=random_state)
         embeddings_df = embeddings_df.reset_index(drop=True)
 
-    # Extract embedding vectors
-    embeddings_array = np.array(embeddings_df["combined_embedding"].tolist())
+    # Extract embedding vectors: copy each row into one preallocated matrix
+    # rather than going through a list of Python lists. float32 halves the
+    # memory traffic of PCA/TSNE, and is all the precision they need.
+    vectors = embeddings_df["combined_embedding"].to_numpy()
+    dim = np.size(vectors[0]) if len(vectors) else 0
+    embeddings_array = np.empty((len(vectors), dim), dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        embeddings_array[i] = vector
     print(f"Embeddings shape: {embeddings_array.shape}")
 
     # Deduplicate OpenAlex
-    openalex_df = openalex_df.drop_duplicates(subset='decoded_abstract', keep='first').copy()
+    openalex_df = openalex_df.drop_duplicates(subset='decoded_abstract', keep='first')
 
     return embeddings_df, openalex_df, embeddings_array
 
 
+def _parse_concepts(concepts_str):
+    """
+    Parse an OpenAlex concepts cell (repr string or list of dicts) into a
+    list of concept dicts. Returns None for missing or unparseable cells.
+    """
+    if isinstance(concepts_str, str):
+        if not concepts_str:
+            return None
+        try:
+            return ast.literal_eval(concepts_str)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return None
+    if concepts_str is None or (isinstance(concepts_str, float) and np.isnan(concepts_str)):
+        return None
+    return concepts_str
+
+
+def _best_concepts_by_level(concepts, levels):
+    """
+    Highest-scored concept name at each of levels (None where a level has no
+    concept), found in a single pass over a parsed concepts list.
+    """
+    if not concepts:
+        return (None,) * len(levels)
+    best = {}
+    try:
+        for c in concepts:
+            level = c.get('level')
+            if level in levels:
+                score = c.get('score', 0)
+                # Strict > keeps the first of equal scores, as max() did
+                if level not in best or score > best[level][0]:
+                    best[level] = (score, c.get('display_name'))
+    except Exception:
+        return (None,) * len(levels)
+    return tuple(best[level][1] if level in best else None for level in levels)
+
+
 def extract_field_from_concepts(concepts_str, level=0):
     """
     Extract research field from OpenAlex concepts at specified hierarchy level.
@@ -304,29 +475,11 @@ def extract_field_from_concepts(concepts_str, level=0):
     Returns:
         Highest-scored concept name at the specified level, or None
     """
-    import ast
-    if pd.isna(concepts_str) or not concepts_str:
-        return None
-    try:
-        if isinstance(concepts_str, str):
-            concepts = ast.literal_eval(concepts_str)
-        else:
-            concepts = concepts_str
-
-        # Filter to specified level and sort by score
-        level_concepts = [c for c in concepts if c.get('level') == level]
-        if not level_concepts:
-            return None
-
-        # Return highest scored
-        best = max(level_concepts, key=lambda x: x.get('score', 0))
-        return best.get('display_name')
-    except:
-        return None
+    return _best_concepts_by_level(_parse_concepts(concepts_str), (level,))[0]
 
 
 def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
-                       sample_str=None):
+                       sample_str=None, use_pyarrow=False):
     """
     Merge TSNE results with metadata and save to CSV and pickle.
 
@@ -336,6 +489,9 @@ def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
         tsne_results: numpy array of TSNE coordinates
         output_dir: Output directory
         sample_str: String to append to filename (e.g., "64K")
+        use_pyarrow: If True (and pyarrow is installed), write the CSV with
+                     pyarrow's multi-threaded writer. Its quoting and bool/float
+                     text differ from the default pandas QUOTE_NONNUMERIC output
 
     Returns:
         Path to saved CSV file
@@ -345,12 +501,10 @@ def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
 
     os.makedirs(output_dir, exist_ok=True)
 
-    # Add TSNE coordinates
-    embeddings_df = embeddings_df.copy()
-    embeddings_df['tsne_x'] = tsne_results[:, 0]
-    embeddings_df['tsne_y'] = tsne_results[:, 1]
-    if tsne_results.shape[1] > 2:
-        embeddings_df['tsne_z'] = tsne_results[:, 2]
+    # TSNE coordinates as their own small frame; the (large) paper frame is
+    # not modified (the concat below still builds one new combined frame)
+    coord_names = ['tsne_x', 'tsne_y', 'tsne_z'][:tsne_results.shape[1]]
+    tsne_df = pd.DataFrame(tsne_results[:, :len(coord_names)], columns=coord_names, index=embeddings_df.index)
 
     # Merge with OpenAlex metadata
     metadata_cols = [
@@ -361,18 +515,23 @@ def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
     available_cols = [c for c in metadata_cols if c in openalex_df.columns]
     openalex_subset = openalex_df[available_cols]
 
-    final_df = embeddings_df.merge(
-        openalex_subset, on='decoded_abstract', how='left', suffixes=('', '_openalex')
-    )
+    # Left join as a keyed lookup: hash the OpenAlex abstracts once into a
+    # unique index, then look up each paper's abstract (first match wins,
+    # openalex_df is already deduplicated on it)
+    lookup = openalex_subset.drop_duplicates(subset='decoded_abstract', keep='first').set_index('decoded_abstract')
+    matched = lookup.reindex(embeddings_df['decoded_abstract']).set_axis(embeddings_df.index)
+    matched.columns = [f'{c}_openalex' if c in embeddings_df.columns else c for c in matched.columns]
+    final_df = pd.concat([embeddings_df, tsne_df, matched], axis=1)
 
     # Extract field hierarchy from concepts (levels 0, 1, 2)
     if 'concepts' in final_df.columns:
         print("Extracting research field hierarchy from concepts...")
-        for level in [0, 1, 2]:
+        # Parse each concepts string once and pick all three levels in one pass over it
+        levels = (0, 1, 2)
+        best_fields = [_best_concepts_by_level(_parse_concepts(x), levels) for x in final_df['concepts']]
+        for i, level in enumerate(levels):
             col_name = f'field_level_{level}'
-            final_df[col_name] = final_df['concepts'].apply(
-                lambda x: extract_field_from_concepts(x, level=level)
-            )
+            final_df[col_name] = [names[i] for names in best_fields]
             n_with_field = final_df[col_name].notna().sum()
             print(f"  Level {level}: {n_with_field:,} / {len(final_df):,} papers")
 
@@ -383,8 +542,9 @@ def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
         'citations_per_year', 'field_level_0', 'field_level_1', 'field_level_2',
         'type', 'language'
     ]
+    # Written straight from final_df by column name; final_df[csv_columns]
+    # would copy every selected column
     csv_columns = [c for c in csv_columns if c in final_df.columns]
-    output_df = final_df[csv_columns].copy()
 
     # Save CSV
     if sample_str:
@@ -392,7 +552,19 @@ def save_tsne_results(embeddings_df, openalex_df, tsne_results, output_dir=None,
     else:
         csv_path = os.path.join(output_dir, "ucl_papers_tsne_mapping.csv")
 
-    output_df.to_csv(csv_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
+    written = False
+    if use_pyarrow and pacsv is not None:
+        try:
+            pacsv.write_csv(
+                pa.Table.from_pandas(final_df, columns=csv_columns, preserve_index=False), csv_path,
+                write_options=pacsv.WriteOptions(quoting_style='needed'),
+            )
+            written = True
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # e.g. an object column holding mixed types
+            print(f"Warning: pyarrow CSV write failed ({e}), falling back to pandas")
+    if not written:
+        final_df.to_csv(csv_path, columns=csv_columns, index=False, quoting=csv.QUOTE_NONNUMERIC)
     print(f"Saved CSV: {csv_path}")
 
     return csv_path
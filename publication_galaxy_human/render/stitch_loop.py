@@ -16,7 +16,11 @@ They meet at frames {4, 32772, 65540} (crossover at 0% and 50% of orbit)
 import os
 import shutil
 import argparse
+import bisect
+import functools
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
 from pathlib import Path
 
 
@@ -30,6 +34,58 @@ RESOLUTION_PRESETS = {
 }
 
 
+# Linux ioctl that clones one file's extents into another (btrfs/xfs reflink)
+FICLONE = 0x40049409
+
+LINK_MODES = ('symlink', 'hardlink', 'reflink', 'copy')
+
+# Frame placement is I/O-bound, so use more threads than cores
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _reflink(src: Path, dst: Path):
+    """Clone src into dst without copying data (copy-on-write filesystems only)."""
+    import fcntl  # POSIX-only; ImportError lands in the caller's fallback
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def _link_or_copy(src: Path, dst: Path, link_mode: str = 'hardlink'):
+    """
+    Place src at dst without duplicating its data where possible.
+    Tries, from the chosen mode down: symlink -> hardlink -> reflink -> shutil.copy2.
+    Frames are never modified after stitching, so sharing them is safe.
+    """
+    # Replace any frame left by a previous run (copy2 overwrote; link would fail)
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    if link_mode == 'symlink':
+        try:
+            os.symlink(src.resolve(strict=True), dst)
+            return
+        except OSError:
+            pass  # Unsupported filesystem: try the next method
+    if link_mode in ('symlink', 'hardlink'):
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # Cross-device or unsupported: try the next method
+    if link_mode in ('symlink', 'hardlink', 'reflink'):
+        try:
+            _reflink(src, dst)
+            return
+        except (OSError, ImportError):
+            try:
+                os.unlink(dst)  # Drop the empty file a failed clone leaves
+            except FileNotFoundError:
+                pass
+    shutil.copy2(src, dst)
+
+
 def parse_resolution(res_str: str) -> tuple[int, int] | None:
     """Parse resolution string like '4K', '1080p', or '1920x1080'."""
     if not res_str:
@@ -56,14 +112,19 @@ def filter_frames_by_step(frames: list[int], step: int, start_offset: int = 4) -
 
 def get_frame_list(directory: Path, extension: str = ".jpg") -> list[int]:
     """Get sorted list of frame numbers from a directory."""
+    # Plain name slicing on scandir entries: no Path object per file
+    n = len(extension)
     frames = []
-    for f in directory.iterdir():
-        if f.suffix.lower() == extension:
-            try:
-                frames.append(int(f.stem))
-            except ValueError:
-                pass
-    return sorted(frames)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name[-n:].lower() == extension:
+                try:
+                    frames.append(int(name[:-n]))
+                except ValueError:
+                    pass
+    frames.sort()
+    return frames
 
 
 def calculate_crossover(orbit_period: int) -> int:
@@ -72,8 +133,13 @@ def calculate_crossover(orbit_period: int) -> int:
 
 
 def find_nearest_frame(target: int, frames: list[int]) -> int:
-    """Find the frame number nearest to target."""
-    return min(frames, key=lambda x: abs(x - target))
+    """Find the frame number nearest to target (frames must be sorted; ties pick the lower)."""
+    i = bisect.bisect_left(frames, target)
+    if i == 0:
+        return frames[0]
+    if i == len(frames):
+        return frames[-1]
+    return frames[i - 1] if target - frames[i - 1] <= frames[i] - target else frames[i]
 
 
 def stitch_loop(
@@ -84,16 +150,25 @@ def stitch_loop(
     crossover_frame: int | None = None,
     extension: str = ".jpg",
     dry_run: bool = False,
-    skip_crossover: bool = True  # If False, include crossover frame in both sequences
+    skip_crossover: bool = True,  # If False, include crossover frame in both sequences
+    link_mode: str = 'hardlink',  # How frames are placed: symlink, hardlink, reflink or copy
+    jobs: int | None = None,  # Parallel file operations (default: DEFAULT_JOBS)
+    materialize: bool = True,  # If False, only plan the sequence (for streaming to ffmpeg)
+    fw_frames: list[int] | None = None,  # Pre-listed frame numbers, skips rescanning fw_dir
+    bw_frames: list[int] | None = None   # Pre-listed frame numbers, skips rescanning bw_dir
 ) -> dict:
     """
     Stitch forward and backward passes into a seamless loop.
 
-    Returns dict with statistics about the operation.
+    Returns dict with statistics about the operation. 'source_files' holds the
+    ordered source frame paths, which create_video can stream directly when
+    the renumbered frames are not materialized in output_dir.
     """
     # Get available frames
-    fw_frames = get_frame_list(fw_dir, extension)
-    bw_frames = get_frame_list(bw_dir, extension)
+    if fw_frames is None:
+        fw_frames = get_frame_list(fw_dir, extension)
+    if bw_frames is None:
+        bw_frames = get_frame_list(bw_dir, extension)
 
     if not fw_frames or not bw_frames:
         raise ValueError("No frames found in one or both directories")
@@ -108,7 +183,7 @@ def stitch_loop(
 
     # Find nearest available crossover frame
     actual_crossover = find_nearest_frame(crossover_frame, fw_frames)
-    crossover_idx = fw_frames.index(actual_crossover)
+    crossover_idx = bisect.bisect_left(fw_frames, actual_crossover)
 
     # Determine frame step
     if len(fw_frames) > 1:
@@ -129,21 +204,14 @@ def stitch_loop(
     else:
         # Include crossover frame (will appear twice at splice point)
         backward_for_reverse = bw_frames[:crossover_idx + 1]  # start to crossover inclusive
-    backward_sequence = list(reversed(backward_for_reverse))  # reverse it
+    backward_sequence = backward_for_reverse[::-1]  # reverse it
 
-    # Combined sequence
-    sequence = []
-
-    # Add forward frames
-    for frame_num in forward_sequence:
-        sequence.append(('fw', frame_num))
-
-    # Add backward frames (reversed)
-    for frame_num in backward_sequence:
-        sequence.append(('bw', frame_num))
+    # Combined sequence of (source dir, frame number), forward then backward
+    sequence = list(chain(zip(repeat(fw_dir), forward_sequence),
+                          zip(repeat(bw_dir), backward_sequence)))
 
     # Create output directory
-    if not dry_run:
+    if not dry_run and materialize:
         output_dir.mkdir(parents=True, exist_ok=True)
 
     # Copy files with sequential numbering
@@ -167,89 +235,297 @@ def stitch_loop(
     print(f"  Skip crossover:  {skip_crossover}")
     print()
 
+    # Format each frame name once: the two halves mostly share frame numbers
+    names = {n: f"{n:04d}{extension}" for n in set(forward_sequence).union(backward_sequence)}
+    stats['source_files'] = [src_dir / names[frame_num] for src_dir, frame_num in sequence]
+
     if dry_run:
         print("DRY RUN - no files copied")
         return stats
+    if not materialize:
+        return stats
 
-    # Copy files
-    for out_idx, (source, frame_num) in enumerate(sequence, start=1):
-        src_dir = fw_dir if source == 'fw' else bw_dir
-        src_file = src_dir / f"{frame_num:04d}{extension}"
-        dst_file = output_dir / f"{out_idx:04d}{extension}"
+    # Place files (hardlinked/cloned where possible, else copied). Each frame is
+    # independent I/O, so they run on a thread pool; workers only report missing
+    # sources, which are printed here in sequence order. The frames were just
+    # listed, so there is no per-frame exists() stat: a vanished source fails
+    # every method and surfaces as FileNotFoundError from copy2. Destination paths are
+    # only built here, when frames are actually written.
+    dst_files = [output_dir / f"{i:04d}{extension}" for i in range(1, len(sequence) + 1)]
+
+    def place(src_file, dst_file):
+        try:
+            _link_or_copy(src_file, dst_file, link_mode)
+        except FileNotFoundError:
+            return src_file
+        return None
 
-        if src_file.exists():
-            shutil.copy2(src_file, dst_file)
-        else:
-            print(f"Warning: Source file not found: {src_file}")
+    with ThreadPoolExecutor(max_workers=jobs or DEFAULT_JOBS) as pool:
+        for missing in pool.map(place, stats['source_files'], dst_files):
+            if missing is not None:
+                print(f"Warning: Source file not found: {missing}")
 
-    print(f"Copied {len(sequence)} frames to {output_dir}")
+    print(f"Copied {len(sequence)} frames to {output_dir} ({link_mode})")
     return stats
 
 
+# ffmpeg decoder for frames piped through image2pipe, by file extension
+PIPE_CODECS = {'.jpg': 'mjpeg', '.jpeg': 'mjpeg', '.png': 'png'}
+
+# Hardware H.264 encoders: (global args, filter appended to each output, codec
+# args taking the CRF-like quality). 'auto' probes them in this order.
+HW_ENCODERS = {
+    'nvenc': ([], None,
+              lambda q: ['-c:v', 'h264_nvenc', '-preset', 'p5', '-tune', 'hq', '-rc', 'vbr',
+                         '-cq', str(q), '-b:v', '0', '-bf', '2', '-pix_fmt', 'yuv420p']),
+    'videotoolbox': ([], None,
+                     lambda q: ['-c:v', 'h264_videotoolbox', '-q:v', str(max(1, 100 - 2 * q)),
+                                '-pix_fmt', 'yuv420p']),
+    'vaapi': (['-vaapi_device', '/dev/dri/renderD128'], 'format=nv12,hwupload',
+              lambda q: ['-c:v', 'h264_vaapi', '-qp', str(q)]),
+}
+ENCODERS = ('x264', 'auto', *HW_ENCODERS)
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_encoder() -> str:
+    """Return the first hardware encoder that completes a tiny test encode, else 'x264'."""
+    for name, (global_args, hw_filter, codec_args) in HW_ENCODERS.items():
+        cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error', *global_args,
+               '-f', 'lavfi', '-i', 'color=size=1280x720:duration=0.1']
+        cmd += ['-vf', hw_filter] if hw_filter else []
+        cmd += [*codec_args(18), '-f', 'null', '-']
+        try:
+            if subprocess.run(cmd, capture_output=True).returncode == 0:
+                return name
+        except OSError:
+            break  # No ffmpeg at all; create_video will report it
+    return 'x264'
+
+
+def _run_ffmpeg(cmd: list[str], frames: list[Path] | None = None):
+    """
+    Run ffmpeg to completion. If frames is given, their bytes are streamed in
+    order into ffmpeg's stdin; missing files are skipped with a warning.
+    """
+    if frames is None:
+        subprocess.run(cmd, check=True)
+        return
+
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        for src_file in frames:
+            try:
+                with open(src_file, 'rb') as f:
+                    shutil.copyfileobj(f, proc.stdin, 1 << 20)
+            except FileNotFoundError:
+                print(f"Warning: Source file not found: {src_file}")
+    except BrokenPipeError:
+        pass  # ffmpeg exited early; its return code is checked below
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _pipe_input_args(fps: int, extension: str) -> list[str]:
+    """ffmpeg input arguments for frames streamed through stdin."""
+    codec = PIPE_CODECS.get(extension.lower())
+    input_args = ['-f', 'image2pipe', '-framerate', str(fps)]
+    input_args += ['-c:v', codec] if codec else []
+    return input_args + ['-i', '-']
+
+
+def _encoder_settings(encoder: str, crf: int) -> tuple[str, list[str], str | None, list[str]]:
+    """Resolve encoder ('auto' probes) to (name, global args, hardware filter, output args)."""
+    if encoder == 'auto':
+        encoder = _detect_encoder()
+    if encoder in HW_ENCODERS:
+        global_args, hw_filter, codec_args = HW_ENCODERS[encoder]
+        return encoder, global_args, hw_filter, [*codec_args(crf), '-movflags', '+faststart']
+    encode_args = [
+        '-c:v', 'libx264',
+        '-preset', 'medium',
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-movflags', '+faststart',
+    ]
+    return 'x264', [], None, encode_args
+
+
+def _scaled_output(output_file: Path, resolution: tuple[int, int]) -> tuple[str, Path]:
+    """Name of the resolution (e.g. 4K) and the downscaled video path next to output_file."""
+    width, height = resolution
+    # Generate resolution suffix
+    res_name = None
+    for name, (w, h) in RESOLUTION_PRESETS.items():
+        if w == width and h == height:
+            res_name = name
+            break
+    if not res_name:
+        res_name = f"{width}x{height}"
+
+    # Create scaled output filename
+    stem = output_file.stem
+    return res_name, output_file.with_name(f"{stem}_{res_name}{output_file.suffix}")
+
+
 def create_video(
     input_dir: Path,
     output_file: Path,
     fps: int = 24,
     extension: str = ".jpg",
     crf: int = 18,
-    resolution: tuple[int, int] | None = None
+    resolution: tuple[int, int] | None = None,
+    frames: list[Path] | None = None,
+    encoder: str = 'x264'
 ):
     """
     Create video from frame sequence using ffmpeg.
 
+    Reads the numbered frames in input_dir, or, if frames is given, streams
+    those files in order through a pipe (no renumbered copies needed).
+
+    encoder picks libx264 or a hardware encoder (see HW_ENCODERS; 'auto'
+    probes for one). If a hardware encode fails, e.g. because the frames exceed
+    its size limit, the video is encoded again with libx264.
+
     If resolution is specified, creates BOTH:
     - Native resolution video (original filename)
     - Downscaled video (with resolution suffix, e.g., _4K.mp4)
     """
-    # Always create native resolution first
-    cmd_native = [
+    if frames is None:
+        input_args = ['-framerate', str(fps), '-i', str(input_dir / f'%04d{extension}')]
+    else:
+        input_args = _pipe_input_args(fps, extension)
+
+    encoder, global_args, hw_filter, encode_args = _encoder_settings(encoder, crf)
+
+    def run(cmd):
+        try:
+            _run_ffmpeg(cmd, frames)
+        except subprocess.CalledProcessError:
+            if encoder not in HW_ENCODERS:
+                raise
+            print(f"Warning: {encoder} encode failed, retrying with libx264")
+            create_video(input_dir, output_file, fps=fps, extension=extension, crf=crf,
+                         resolution=resolution, frames=frames, encoder='x264')
+            return False
+        return True
+
+    if not resolution:
+        cmd = ['ffmpeg', '-y', *global_args, *input_args]
+        cmd += ['-vf', hw_filter] if hw_filter else []
+        cmd += [*encode_args, str(output_file)]
+        print(f"Creating video (native, {encoder}): {output_file}")
+        if run(cmd):
+            print(f"Video created: {output_file}")
+        return
+
+    width, height = resolution
+    res_name, scaled_file = _scaled_output(output_file, resolution)
+
+    # One ffmpeg run for both videos: the frames are read and decoded once,
+    # then split into the native encoder and a downscaled one
+    graph = f'[0:v]split=2[native][full];[full]scale={width}:{height}:flags=lanczos[scaled]'
+    if hw_filter:
+        graph = (f'[0:v]split=2[n][full];[n]{hw_filter}[native];'
+                 f'[full]scale={width}:{height}:flags=lanczos,{hw_filter}[scaled]')
+    cmd = [
         'ffmpeg', '-y',
-        '-framerate', str(fps),
-        '-i', str(input_dir / f'%04d{extension}'),
-        '-c:v', 'libx264',
-        '-preset', 'medium',
-        '-crf', str(crf),
-        '-pix_fmt', 'yuv420p',
-        '-movflags', '+faststart',
-        str(output_file)
+        *global_args,
+        *input_args,
+        '-filter_complex', graph,
+        '-map', '[native]', *encode_args, str(output_file),
+        '-map', '[scaled]', *encode_args, str(scaled_file),
     ]
 
-    print(f"Creating video (native): {output_file}")
-    subprocess.run(cmd_native, check=True)
-    print(f"Video created: {output_file}")
+    print(f"Creating videos (native + {res_name}, {encoder}): {output_file}, {scaled_file}")
+    if run(cmd):
+        print(f"Video created: {output_file}")
+        print(f"Video created: {scaled_file}")
+
 
-    # If resolution specified, also create downscaled version
-    if resolution:
+def create_videos_fused(
+    videos: list[tuple[Path, list[Path]]],
+    fps: int = 24,
+    extension: str = ".jpg",
+    crf: int = 18,
+    resolution: tuple[int, int] | None = None,
+    encoder: str = 'x264'
+):
+    """
+    Encode several frame sequences with a single ffmpeg process.
+
+    videos is a list of (output_file, frames). All frames are streamed through
+    one pipe back to back; the filter graph trims the stream into one segment
+    per video (plus a downscaled copy of each if resolution is given), so
+    ffmpeg starts and builds its decoder and graph only once.
+    """
+    # The trims count frames in the shared stream, so a file skipped while
+    # streaming would shift every later segment; drop missing files up front
+    present = []
+    for output_file, frames in videos:
+        found = []
+        for src_file in frames:
+            if os.path.isfile(src_file):
+                found.append(src_file)
+            else:
+                print(f"Warning: Source file not found: {src_file}")
+        present.append((output_file, found))
+    videos = present
+
+    encoder, global_args, hw_filter, encode_args = _encoder_settings(encoder, crf)
+    hw_suffix = f',{hw_filter}' if hw_filter else ''
+
+    graph = ['[0:v]split=' + str(len(videos)) + ''.join(f'[in{k}]' for k in range(len(videos)))]
+    outputs = []
+    created = []
+    start = 0
+    for k, (output_file, frames) in enumerate(videos):
+        end = start + len(frames)
+        segment = f'[in{k}]trim=start_frame={start}:end_frame={end},setpts=PTS-STARTPTS'
+        start = end
+        if not resolution:
+            graph.append(f'{segment}{hw_suffix}[v{k}]')
+            outputs += ['-map', f'[v{k}]', *encode_args, str(output_file)]
+            created.append(output_file)
+            continue
         width, height = resolution
-        # Generate resolution suffix
-        res_name = None
-        for name, (w, h) in RESOLUTION_PRESETS.items():
-            if w == width and h == height:
-                res_name = name
-                break
-        if not res_name:
-            res_name = f"{width}x{height}"
-
-        # Create scaled output filename
-        stem = output_file.stem
-        scaled_file = output_file.with_name(f"{stem}_{res_name}{output_file.suffix}")
-
-        cmd_scaled = [
-            'ffmpeg', '-y',
-            '-framerate', str(fps),
-            '-i', str(input_dir / f'%04d{extension}'),
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', str(crf),
-            '-pix_fmt', 'yuv420p',
-            '-vf', f'scale={width}:{height}:flags=lanczos',
-            '-movflags', '+faststart',
-            str(scaled_file)
-        ]
-
-        print(f"Creating video ({res_name}): {scaled_file}")
-        subprocess.run(cmd_scaled, check=True)
-        print(f"Video created: {scaled_file}")
+        _, scaled_file = _scaled_output(output_file, resolution)
+        if hw_filter:
+            graph.append(f'{segment},split=2[n{k}][f{k}]')
+            graph.append(f'[n{k}]{hw_filter}[v{k}]')
+        else:
+            graph.append(f'{segment},split=2[v{k}][f{k}]')
+        graph.append(f'[f{k}]scale={width}:{height}:flags=lanczos{hw_suffix}[s{k}]')
+        outputs += ['-map', f'[v{k}]', *encode_args, str(output_file)]
+        outputs += ['-map', f'[s{k}]', *encode_args, str(scaled_file)]
+        created += [output_file, scaled_file]
+
+    cmd = [
+        'ffmpeg', '-y',
+        *global_args,
+        *_pipe_input_args(fps, extension),
+        '-filter_complex', ';'.join(graph),
+        *outputs,
+    ]
+
+    print(f"Creating {len(created)} videos in one ffmpeg run ({encoder})")
+    try:
+        _run_ffmpeg(cmd, [f for _, frames in videos for f in frames])
+    except subprocess.CalledProcessError:
+        if encoder not in HW_ENCODERS:
+            raise
+        print(f"Warning: {encoder} encode failed, retrying with libx264")
+        create_videos_fused(videos, fps=fps, extension=extension, crf=crf,
+                            resolution=resolution, encoder='x264')
+        return
+    for video in created:
+        print(f"Video created: {video}")
 
 
 def stitch_both_crossovers(
@@ -261,22 +537,51 @@ def stitch_both_crossovers(
     fps: int = 24,
     dry_run: bool = False,
     skip_crossover: bool = True,
-    resolution: tuple[int, int] | None = None
+    resolution: tuple[int, int] | None = None,
+    link_mode: str = 'hardlink',
+    jobs: int | None = None,
+    materialize: bool = False,
+    parallel_encodes: int = 2,
+    fw_frames: list[int] | None = None,
+    bw_frames: list[int] | None = None,
+    encoder: str = 'x264',
+    fused_encode: bool = False
 ) -> dict:
     """
     Create videos for BOTH crossover points:
     1. Crossover at 50% (halfway) - cameras meet on opposite side
     2. Crossover at 0% (start) - cameras meet at starting position
 
+    Frames are streamed straight into ffmpeg; with materialize=True the
+    renumbered frames are also written to the per-crossover directories.
+    Each video starts encoding as soon as its sequence is stitched, so the
+    second stitch (I/O-bound) overlaps the first encode (CPU-bound); up to
+    parallel_encodes ffmpeg runs go at once (x264 rarely saturates a many-core
+    machine alone). With fused_encode, a single ffmpeg process encodes both
+    after both sequences are planned.
+
     Returns dict with stats for both videos.
     """
     results = {}
 
-    # Get available frames to determine the actual range
-    fw_frames = get_frame_list(fw_dir, extension)
+    # List both directories once (unless given); both crossovers reuse the lists
+    if fw_frames is None:
+        fw_frames = get_frame_list(fw_dir, extension)
+    if bw_frames is None:
+        bw_frames = get_frame_list(bw_dir, extension)
     start_frame = fw_frames[0]
     end_frame = fw_frames[-1]
 
+    # Per-video encodes run in the background while the next crossover stitches
+    encode_pool = None
+    if not dry_run and not fused_encode:
+        encode_pool = ThreadPoolExecutor(max_workers=max(1, parallel_encodes))
+    pending = []
+
+    def encode(input_dir, video, stats):
+        create_video(input_dir, video, fps=fps, extension=extension, resolution=resolution,
+                     frames=None if materialize else stats['source_files'], encoder=encoder)
+
     # Crossover 1: At halfway point (50%)
     crossover_halfway = orbit_period // 2
     output_dir_1 = Path(f"{output_base}_crossover_50pct")
@@ -294,11 +599,17 @@ def stitch_both_crossovers(
         crossover_frame=crossover_halfway,
         extension=extension,
         dry_run=dry_run,
-        skip_crossover=skip_crossover
+        skip_crossover=skip_crossover,
+        link_mode=link_mode,
+        jobs=jobs,
+        materialize=materialize,
+        fw_frames=fw_frames,
+        bw_frames=bw_frames
     )
 
-    if not dry_run:
-        create_video(output_dir_1, video_1, fps=fps, extension=extension, resolution=resolution)
+    encodes = [(output_dir_1, video_1, results['crossover_50pct'])]
+    if encode_pool is not None:
+        pending.append(encode_pool.submit(encode, *encodes[-1]))
 
     # Crossover 2: At start point (0% / 100%)
     # Target is orbit_period (60000) where cameras meet at 0%
@@ -312,19 +623,40 @@ def stitch_both_crossovers(
     print("CROSSOVER 2: Position ~0% (near starting position)")
     print("=" * 60)
 
-    results['crossover_0pct'] = stitch_loop(
-        fw_dir=fw_dir,
-        bw_dir=bw_dir,
-        output_dir=output_dir_2,
-        orbit_period=orbit_period,
-        crossover_frame=crossover_start,
-        extension=extension,
-        dry_run=dry_run,
-        skip_crossover=skip_crossover
-    )
-
-    if not dry_run:
-        create_video(output_dir_2, video_2, fps=fps, extension=extension, resolution=resolution)
+    try:
+        results['crossover_0pct'] = stitch_loop(
+            fw_dir=fw_dir,
+            bw_dir=bw_dir,
+            output_dir=output_dir_2,
+            orbit_period=orbit_period,
+            crossover_frame=crossover_start,
+            extension=extension,
+            dry_run=dry_run,
+            skip_crossover=skip_crossover,
+            link_mode=link_mode,
+            jobs=jobs,
+            materialize=materialize,
+            fw_frames=fw_frames,
+            bw_frames=bw_frames
+        )
+    except BaseException:
+        if encode_pool is not None:
+            # Let the first encode finish, and report it if it failed too
+            encode_pool.shutdown(wait=True)
+            for future in pending:
+                if future.exception() is not None:
+                    print(f"Warning: {video_1} encode failed: {future.exception()}")
+        raise
+
+    encodes.append((output_dir_2, video_2, results['crossover_0pct']))
+    if encode_pool is not None:
+        pending.append(encode_pool.submit(encode, *encodes[-1]))
+        encode_pool.shutdown(wait=True)
+        for future in pending:
+            future.result()  # Re-raise any ffmpeg failure
+    elif not dry_run:
+        create_videos_fused([(video, stats['source_files']) for _, video, stats in encodes],
+                            fps=fps, extension=extension, resolution=resolution, encoder=encoder)
 
     return results
 
@@ -338,6 +670,9 @@ def main():
     parser.add_argument('--crossover', type=int, help='Override crossover frame (default: orbit_period/2)')
     parser.add_argument('--extension', default='.jpg', help='File extension (default: .jpg)')
     parser.add_argument('--fps', type=int, default=24, help='Video framerate (default: 24)')
+    parser.add_argument('--encoder', choices=ENCODERS, default='x264',
+                        help='H.264 encoder: x264 (default), a hardware encoder, or auto to use the '
+                             'first working hardware encoder. Falls back to x264 if it fails.')
     parser.add_argument('--video', type=Path, help='Output video file (optional)')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done without copying')
     parser.add_argument('--both-crossovers', action='store_true',
@@ -348,18 +683,29 @@ def main():
                         help='Filter frames to consistent step interval (e.g., 1024, 2048)')
     parser.add_argument('--resolution', type=str,
                         help='Also create downscaled video (e.g., 4K, 1080p, 1920x1080). Native always saved.')
+    parser.add_argument('--link-mode', choices=LINK_MODES, default='hardlink',
+                        help='How frames are placed in the output: symlink, hardlink (default), reflink or copy. '
+                             'Falls back down that list when a method is unavailable.')
+    parser.add_argument('--materialize', action='store_true',
+                        help='Also write the renumbered frames when encoding video (by default frames '
+                             'are streamed straight into ffmpeg; without a video they are always written)')
+    parser.add_argument('--fused-encode', action='store_true',
+                        help='With --both-crossovers, encode both videos in one ffmpeg process '
+                             '(one start-up and filter graph; segments encode one after the other)')
+    parser.add_argument('--parallel-encodes', type=int, default=2,
+                        help='With --both-crossovers, how many videos to encode at once (default: 2)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Parallel file operations when stitching (default: {DEFAULT_JOBS})')
 
     args = parser.parse_args()
     skip_crossover = not args.no_skip_crossover
     resolution = parse_resolution(args.resolution) if args.resolution else None
 
-    # If step filtering requested, create filtered temp directories
-    fw_dir = args.fw_dir
-    bw_dir = args.bw_dir
-    temp_dirs = []
+    # If step filtering requested, hand the filtered frame lists straight to
+    # stitch_loop; frames are read from the original directories
+    fw_frames = bw_frames = None
 
     if args.step:
-        import tempfile
         # Get frames from both directories
         fw_frames = get_frame_list(args.fw_dir, args.extension)
         bw_frames = get_frame_list(args.bw_dir, args.extension)
@@ -379,60 +725,57 @@ def main():
         print(f"Filtering to step {args.step}: {len(filtered_frames)} frames "
               f"(from {len(common_frames)} common frames)")
 
-        # Create temp directories with symlinks to filtered frames
-        fw_temp = Path(tempfile.mkdtemp(prefix='stitch_fw_'))
-        bw_temp = Path(tempfile.mkdtemp(prefix='stitch_bw_'))
-        temp_dirs = [fw_temp, bw_temp]
-
-        for frame in filtered_frames:
-            fw_src = args.fw_dir / f"{frame:04d}{args.extension}"
-            bw_src = args.bw_dir / f"{frame:04d}{args.extension}"
-            if fw_src.exists():
-                (fw_temp / f"{frame:04d}{args.extension}").symlink_to(fw_src)
-            if bw_src.exists():
-                (bw_temp / f"{frame:04d}{args.extension}").symlink_to(bw_src)
-
-        fw_dir = fw_temp
-        bw_dir = bw_temp
+        fw_frames = bw_frames = filtered_frames
+
+    if args.both_crossovers:
+        # Generate both crossover videos
+        results = stitch_both_crossovers(
+            fw_dir=args.fw_dir,
+            bw_dir=args.bw_dir,
+            output_base=args.output_dir,
+            orbit_period=args.orbit_period,
+            extension=args.extension,
+            fps=args.fps,
+            dry_run=args.dry_run,
+            skip_crossover=skip_crossover,
+            resolution=resolution,
+            link_mode=args.link_mode,
+            jobs=args.jobs,
+            materialize=args.materialize,
+            parallel_encodes=args.parallel_encodes,
+            fw_frames=fw_frames,
+            bw_frames=bw_frames,
+            encoder=args.encoder,
+            fused_encode=args.fused_encode
+        )
+        return results
+    else:
+        # Single crossover (original behavior). Frames only need writing
+        # if they are the output, or if asked to keep them alongside the video;
+        # otherwise nothing is written to disk but the video itself.
+        materialize = args.materialize or not args.video
+        stats = stitch_loop(
+            fw_dir=args.fw_dir,
+            bw_dir=args.bw_dir,
+            output_dir=args.output_dir,
+            orbit_period=args.orbit_period,
+            crossover_frame=args.crossover,
+            extension=args.extension,
+            dry_run=args.dry_run,
+            skip_crossover=skip_crossover,
+            link_mode=args.link_mode,
+            jobs=args.jobs,
+            materialize=materialize,
+            fw_frames=fw_frames,
+            bw_frames=bw_frames
+        )
+
+        if args.video and not args.dry_run:
+            create_video(args.output_dir, args.video, fps=args.fps, extension=args.extension,
+                         resolution=resolution, frames=None if materialize else stats['source_files'],
+                         encoder=args.encoder)
 
-    try:
-        if args.both_crossovers:
-            # Generate both crossover videos
-            results = stitch_both_crossovers(
-                fw_dir=fw_dir,
-                bw_dir=bw_dir,
-                output_base=args.output_dir,
-                orbit_period=args.orbit_period,
-                extension=args.extension,
-                fps=args.fps,
-                dry_run=args.dry_run,
-                skip_crossover=skip_crossover,
-                resolution=resolution
-            )
-            return results
-        else:
-            # Single crossover (original behavior)
-            stats = stitch_loop(
-                fw_dir=fw_dir,
-                bw_dir=bw_dir,
-                output_dir=args.output_dir,
-                orbit_period=args.orbit_period,
-                crossover_frame=args.crossover,
-                extension=args.extension,
-                dry_run=args.dry_run,
-                skip_crossover=skip_crossover
-            )
-
-            if args.video and not args.dry_run:
-                create_video(args.output_dir, args.video, fps=args.fps, extension=args.extension,
-                             resolution=resolution)
-
-            return stats
-    finally:
-        # Clean up temp directories
-        for temp_dir in temp_dirs:
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+        return stats
 
 
 if __name__ == '__main__':
@@ -4,12 +4,29 @@ Stitch with focal length correction.
 Crops BW frames (14mm) to match FW frames (18mm) before stitching.
 """
 
+import os
 import subprocess
 import shutil
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import sys
 
+from stitch_loop import get_frame_list
+
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
+try:
+    import cv2
+    from turbojpeg import TurboJPEG
+    turbo = TurboJPEG()  # Raises if the libturbojpeg shared library is missing
+except (ImportError, OSError, RuntimeError):
+    cv2 = turbo = None
+
 # Focal length parameters
 FW_FOCAL = 18
 BW_FOCAL = 14
@@ -23,18 +40,186 @@ CROP_H = int(HEIGHT * SCALE) - (int(HEIGHT * SCALE) % 2)
 OFFSET_X = (WIDTH - CROP_W) // 2
 OFFSET_Y = (HEIGHT - CROP_H) // 2
 
+# Concurrent workers for the BW frames; one ffmpeg run leaves most cores idle
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
 CROP_FILTER = f"crop={CROP_W}:{CROP_H}:{OFFSET_X}:{OFFSET_Y},scale={WIDTH}:{HEIGHT}:flags=lanczos"
 
+# JPEG quality of the corrected BW frames. libvips and turbojpeg take the
+# libjpeg 1-100 quality; ffmpeg's mjpeg encoder only takes a 2-31 qscale
+# (2 = best), which has no exact libjpeg equivalent. Frames from the ffmpeg
+# fallback are therefore of similar but not identical quality.
+JPEG_QUALITY = 92
+FFMPEG_QSCALE = 2
+
+
+def link_frames(frames: list[int], src_dir: Path, dst_dir: Path):
+    """
+    Symlink src_dir/NNNN.jpg for each frame into dst_dir.
+
+    Uses os.symlink relative to one open directory fd with plain string targets:
+    no Path objects and no lookup of dst_dir per link. Targets are absolute
+    so the links also work when src_dir was given as a relative path.
+    """
+    src_root = os.path.abspath(src_dir)
+    dir_fd = os.open(dst_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for frame in frames:
+            name = f"{frame:04d}.jpg"
+            os.symlink(f"{src_root}/{name}", name, dir_fd=dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _jpeg_scan(buf: bytearray, i: int, in_scan: bool) -> tuple[int | None, int, bool]:
+    """
+    Continue looking for the EOI of the JPEG at the start of buf.
+
+    Walks the marker segments by their lengths and scans entropy-coded data
+    for the next real marker (0xFF not followed by a 0x00 stuffing byte or an
+    RSTn), so 0xFFD9 byte pairs inside segments are never mistaken for EOI.
+    Scanning starts at offset i, inside entropy-coded data if in_scan.
+
+    Returns (end, i, in_scan): end is the index just past the EOI, or None if
+    buf is incomplete, in which case the call is repeated with the returned
+    i and in_scan once more bytes have been appended (nothing is rescanned).
+    """
+    n = len(buf)
+    while True:
+        if in_scan:
+            # Entropy-coded scan data follows SOS: find the next marker
+            while True:
+                j = buf.find(b'\xff', i)
+                if j < 0:
+                    return None, max(i, n), True
+                if j + 1 >= n:
+                    return None, j, True
+                nxt = buf[j + 1]
+                if nxt == 0x00 or 0xD0 <= nxt <= 0xD7:
+                    i = j + 2
+                elif nxt == 0xFF:
+                    i = j + 1
+                else:
+                    i = j
+                    in_scan = False
+                    break
+        if i + 4 > n:
+            if i + 2 <= n and buf[i] == 0xFF and buf[i + 1] == 0xD9:
+                return i + 2, i, False
+            return None, i, False
+        if buf[i] != 0xFF:
+            raise ValueError("Corrupt JPEG stream from ffmpeg")
+        marker = buf[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        if marker == 0xD9:
+            return i + 2, i, False
+        i += 2 + ((buf[i + 2] << 8) | buf[i + 3])
+        in_scan = marker == 0xDA
+
+
+def _read_jpegs(stream):
+    """Yield each JPEG from a concatenated stream (e.g. ffmpeg image2pipe output)."""
+    buf = bytearray()
+    pos, in_scan = 2, False  # Just past the SOI of the JPEG at the start of buf
+    while True:
+        chunk = stream.read(1 << 20)
+        if not chunk:
+            return
+        buf += chunk
+        while buf:
+            end, pos, in_scan = _jpeg_scan(buf, pos, in_scan)
+            if end is None:
+                break
+            yield bytes(buf[:end])
+            del buf[:end]
+            pos, in_scan = 2, False
+
+
+def process_bw_frame_vips(src: Path, dst: Path):
+    """Apply focal length correction to a BW frame in-process with libvips."""
+    image = pyvips.Image.new_from_file(str(src), access='sequential')
+    image = image.crop(OFFSET_X, OFFSET_Y, CROP_W, CROP_H)
+    image = image.resize(WIDTH / CROP_W, vscale=HEIGHT / CROP_H, kernel='lanczos3')
+    image.jpegsave(str(dst), Q=JPEG_QUALITY, optimize_coding=True)
+
+
+def process_bw_frame_turbo(src: Path, dst: Path):
+    """Apply focal length correction to a BW frame with libjpeg-turbo and OpenCV."""
+    with open(src, 'rb') as f:
+        image = turbo.decode(f.read())
+    crop = image[OFFSET_Y:OFFSET_Y + CROP_H, OFFSET_X:OFFSET_X + CROP_W]
+    scaled = cv2.resize(crop, (WIDTH, HEIGHT), interpolation=cv2.INTER_LANCZOS4)
+    with open(dst, 'wb') as f:
+        f.write(turbo.encode(scaled, quality=JPEG_QUALITY))
+
+
+def process_bw_frames(frames: list[int], bw_dir: Path, dst_dir: Path):
+    """
+    Apply focal length correction to many BW frames.
+
+    With pyvips installed each frame is decoded, cropped, scaled and encoded
+    in-process (streaming, no subprocess); failing that, PyTurboJPEG and
+    OpenCV do the same with SIMD decode and resize. Otherwise one long-lived ffmpeg
+    handles them all: frames are streamed into its stdin, and the corrected
+    JPEGs it writes to stdout are split apart and saved under their original
+    frame numbers in dst_dir, with no staging directory or renames.
+    """
+    if pyvips is not None:
+        for frame in frames:
+            process_bw_frame_vips(bw_dir / f"{frame:04d}.jpg", dst_dir / f"{frame:04d}.jpg")
+        return
+    if turbo is not None:
+        for frame in frames:
+            process_bw_frame_turbo(bw_dir / f"{frame:04d}.jpg", dst_dir / f"{frame:04d}.jpg")
+        return
 
-def process_bw_frame(src: Path, dst: Path):
-    """Apply focal length correction to a BW frame."""
     cmd = [
-        'ffmpeg', '-y', '-i', str(src),
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'image2pipe', '-c:v', 'mjpeg', '-i', '-',
         '-vf', CROP_FILTER,
-        '-q:v', '2',  # High quality JPEG
-        str(dst)
+        '-q:v', str(FFMPEG_QSCALE),  # High quality JPEG, see JPEG_QUALITY
+        '-f', 'image2pipe', '-c:v', 'mjpeg', '-'
     ]
-    subprocess.run(cmd, capture_output=True, check=True)
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    # Feed from a thread: ffmpeg blocks on a full stdout pipe until it is read here
+    feed_error = []
+
+    def feed():
+        try:
+            for frame in frames:
+                with open(bw_dir / f"{frame:04d}.jpg", 'rb') as f:
+                    shutil.copyfileobj(f, proc.stdin, 1 << 20)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code is checked below
+        except OSError as e:
+            feed_error.append(e)  # e.g. a missing source frame; re-raised below
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    written = 0
+    try:
+        for frame, data in zip(frames, _read_jpegs(proc.stdout)):
+            (dst_dir / f"{frame:04d}.jpg").write_bytes(data)
+            written += 1
+        proc.stdout.read()
+    except BaseException:
+        proc.kill()  # e.g. a frame could not be written; don't leave ffmpeg running
+        raise
+    finally:
+        feeder.join()
+        proc.wait()
+    if feed_error:
+        raise feed_error[0]
+    if proc.returncode != 0 or written != len(frames):
+        raise subprocess.CalledProcessError(proc.returncode or 1, cmd)
 
 
 def main():
@@ -47,23 +232,24 @@ def main():
     parser.add_argument('--step', type=int, default=256)
     parser.add_argument('--fps', type=int, default=24)
     parser.add_argument('--resolution', type=str, default=None, help='Also create downscaled (e.g., 4K)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Concurrent workers for the BW frames (default: {DEFAULT_JOBS})')
 
     args = parser.parse_args()
 
     print(f"Focal length correction: {BW_FOCAL}mm -> {FW_FOCAL}mm")
-    print(f"Crop filter: {CROP_FILTER}")
+    backend = 'libvips' if pyvips is not None else 'turbojpeg' if turbo is not None else 'ffmpeg'
+    print(f"Crop filter: {CROP_FILTER} ({backend})")
     print()
 
     # Get common frames at specified step
-    fw_frames = set(int(f.stem) for f in args.fw_dir.iterdir()
-                    if f.suffix == '.jpg' and not f.name.startswith('.'))
-    bw_frames = set(int(f.stem) for f in args.bw_dir.iterdir()
-                    if f.suffix == '.jpg' and not f.name.startswith('.'))
-    common = sorted(fw_frames & bw_frames)
+    # get_frame_list is sorted, so filtering it keeps the order without re-sorting
+    fw_frames = get_frame_list(args.fw_dir)
+    bw_frames = set(get_frame_list(args.bw_dir))
+    common = [f for f in fw_frames if f in bw_frames]
 
-    # Filter to step
-    expected = set(range(4, 65541, args.step))
-    filtered = sorted(set(common) & expected)
+    # Filter to step: the frames in range(4, 65541, step), tested arithmetically
+    filtered = [f for f in common if 4 <= f <= 65540 and (f - 4) % args.step == 0]
 
     print(f"Common frames: {len(common)}")
     print(f"Filtered to step {args.step}: {len(filtered)} frames")
@@ -72,23 +258,30 @@ def main():
     with tempfile.TemporaryDirectory(prefix='bw_focal_fix_') as bw_temp:
         bw_temp = Path(bw_temp)
 
-        print(f"\nProcessing BW frames with focal correction...")
-        for i, frame in enumerate(filtered):
-            src = args.bw_dir / f"{frame:04d}.jpg"
-            dst = bw_temp / f"{frame:04d}.jpg"
-            if src.exists():
-                process_bw_frame(src, dst)
-                if (i + 1) % 20 == 0:
-                    print(f"  Processed {i + 1}/{len(filtered)} BW frames")
-        print(f"  Done processing {len(filtered)} BW frames")
+        if (CROP_W, CROP_H) == (WIDTH, HEIGHT):
+            # Equal focal lengths leave nothing to crop: link the frames as they
+            # are rather than decoding and re-encoding them (a lossy no-op)
+            print("\nBW frames need no focal correction, linking them unchanged")
+            link_frames(filtered, args.bw_dir, bw_temp)
+        else:
+            print(f"\nProcessing BW frames with focal correction...")
+            # Each worker crops a contiguous slice of the frames (libvips,
+            # libjpeg-turbo and OpenCV all release the GIL)
+            chunk = max(1, -(-len(filtered) // max(1, args.jobs)))
+            chunks = [filtered[i:i + chunk] for i in range(0, len(filtered), chunk)]
+            with ThreadPoolExecutor(max_workers=max(1, len(chunks))) as pool:
+                futures = {pool.submit(process_bw_frames, c, args.bw_dir, bw_temp): len(c) for c in chunks}
+                done = 0
+                for future in as_completed(futures):
+                    future.result()
+                    done += futures[future]
+                    print(f"  Processed {done}/{len(filtered)} BW frames")
+            print(f"  Done processing {len(filtered)} BW frames")
 
         # Create temp FW directory with symlinks
         with tempfile.TemporaryDirectory(prefix='fw_filtered_') as fw_temp:
             fw_temp = Path(fw_temp)
-            for frame in filtered:
-                src = args.fw_dir / f"{frame:04d}.jpg"
-                if src.exists():
-                    (fw_temp / f"{frame:04d}.jpg").symlink_to(src)
+            link_frames(filtered, args.fw_dir, fw_temp)  # listed above, so all exist
 
             # Now run the regular stitch script
             print("\nRunning stitch...")